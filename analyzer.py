@@ -18,10 +18,27 @@ from typing import Any
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 
 import dedup
 
+try:
+    import lxml  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:  # lxml未導入時は標準ライブラリのパーサを使う
+    _HTML_PARSER = "html.parser"
+
+_WS_RE = re.compile(r"\s+")
+_NETLOC_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+\-.]*://([^/?#]+)")
+
+# 接続（TLSハンドシェイク含む）を再利用するため、HTTPセッションはモジュールで共有する
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "security-news-digest/1.0"
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
 
 def fetch_reference(url: str) -> list[dict[str, str]]:
     """参照URL（第三者ページ）から記事タイトルとURLを抽出する。
@@ -40,31 +57,38 @@ def fetch_reference(url: str) -> list[dict[str, str]]:
     -----
     ページ構造はサイトごとに異なるため、厳密な抽出ではなく、HTML中の ``a[href]`` を
     基本として「テキスト（タイトル）」「リンクURL」を収集する。
+    lxml がインストールされていれば高速なCパーサを使用する。
     """
-    resp = requests.get(url, timeout=20, headers={"User-Agent": "security-news-digest/1.0"})
+    resp = _SESSION.get(url, timeout=20)
     resp.raise_for_status()
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    items: list[dict[str, str]] = []
-
-    seen: set[str] = set()
+    # Content-Typeに文字コードが無い場合、requestsは text/* を ISO-8859-1 とみなして文字化けさせるため、
+    # バイト列のまま渡してパーサに <meta> の charset を読ませる
+    html: str | bytes = resp.content
+    if "charset=" in resp.headers.get("Content-Type", "").lower():
+        try:
+            html = resp.content.decode(resp.encoding or "utf-8", errors="replace")
+        except LookupError:
+            html = resp.content.decode("utf-8", errors="replace")
+
+    # リンク抽出のみが目的なので、a要素以外はツリーを構築しない
+    soup = BeautifulSoup(html, _HTML_PARSER, parse_only=SoupStrainer("a", href=True))
+    # URLをキーとした挿入順保持の辞書で、重複排除と出現順の保持を兼ねる
+    items_by_url: dict[str, dict[str, str]] = {}
     for a in soup.find_all("a", href=True):
         href = a.get("href")
-        if not href:
+        if not href or not href.startswith(("http://", "https://")):
             continue
-        if not href.startswith("http://") and not href.startswith("https://"):
+        if href in items_by_url:
             continue
 
-        title = " ".join(a.get_text(" ", strip=True).split())
+        title = _WS_RE.sub(" ", a.get_text(" ", strip=True)).strip()
         if not title:
             continue
 
-        if href in seen:
-            continue
-        seen.add(href)
-        items.append({"title": title, "url": href})
+        items_by_url[href] = {"title": title, "url": href}
 
-    return items
+    return list(items_by_url.values())
 
 
 def _url_norm(u: str) -> str:
@@ -92,48 +116,45 @@ def find_gaps(reference_articles: list[dict[str, str]], digest_articles: list[di
     一致判定は以下の順で行う。
 
     1) URLの完全一致（末尾/を除いた比較）
-    2) タイトルの類似度（dedup.titles_similar + 正規化）
+    2) タイトルの類似度（正規化 + dedup.match_any による一括判定）
     """
     digest_urls = {_url_norm(a.get("url", "")) for a in digest_articles if a.get("url")}
-    digest_titles_norm = [dedup.normalize_title(a.get("title", "")) for a in digest_articles]
+    # 同一タイトルは複数URL分のレコードになるため、一意かつ空でないものだけ比較対象にする
+    digest_titles_norm = list(
+        dict.fromkeys(t for a in digest_articles if (t := dedup.normalize_title(a.get("title", ""))))
+    )
 
-    gaps: list[dict[str, Any]] = []
+    # URLで一致しなかった参照記事のみ、タイトル類似度をまとめて判定する
+    unresolved: list[dict[str, str]] = []
     for ref in reference_articles:
         ref_url = _url_norm(ref.get("url", ""))
-        ref_title = ref.get("title", "")
-
-        matched = False
-        if ref_url and ref_url in digest_urls:
-            matched = True
-        else:
-            ref_norm = dedup.normalize_title(ref_title)
-            for dt in digest_titles_norm:
-                if dt and ref_norm and dedup.titles_similar(ref_norm, dt):
-                    matched = True
-                    break
-
-        if not matched:
-            gaps.append({"title": ref_title, "url": ref.get("url", ""), "matched": False})
+        if not (ref_url and ref_url in digest_urls):
+            unresolved.append(ref)
+    title_matched = dedup.match_any(
+        [dedup.normalize_title(ref.get("title", "")) for ref in unresolved], digest_titles_norm
+    )
 
-    return gaps
+    return [
+        {"title": ref.get("title", ""), "url": ref.get("url", ""), "matched": False}
+        for ref, matched in zip(unresolved, title_matched, strict=True)
+        if not matched
+    ]
 
 
 def _domains_from_feeds(feeds_config: list[dict[str, str]]) -> set[str]:
     """feeds設定からドメイン集合を抽出する。"""
-    domains: set[str] = set()
-    for f in feeds_config or []:
-        u = f.get("url", "")
-        if not u:
-            continue
-        try:
-            domains.add(urlparse(u).netloc.lower())
-        except Exception:
-            continue
+    domains = {_extract_domain(f.get("url", "")) for f in feeds_config or []}
     return {d for d in domains if d}
 
 
 def _extract_domain(url: str) -> str:
-    """URLからドメインを抽出する。"""
+    """URLからドメインを抽出する。
+
+    ``scheme://netloc`` 形式は正規表現で直接取り出し、それ以外のみ urlparse で解析する。
+    """
+    m = _NETLOC_RE.match(url)
+    if m:
+        return m.group(1).lower()
     try:
         return urlparse(url).netloc.lower()
     except Exception:
@@ -148,10 +169,98 @@ def _parse_interest_keywords(config: dict) -> list[str]:
     return [str(k) for k in kws if str(k).strip()]
 
 
-def _matches_interest(text: str, keywords: list[str]) -> bool:
-    """テキストが興味キーワードに一致するかを判定する。"""
+def _matches_interest(text: str, keywords_lower: tuple[str, ...]) -> bool:
+    """テキストが興味キーワード（小文字化済み）に一致するかを判定する。"""
     t = text.lower()
-    return any(k.lower() in t for k in keywords)
+    return any(k in t for k in keywords_lower)
+
+
+@dataclass
+class ClassifierIndex:
+    """原因推定で全ギャップに共通する前処理結果。"""
+
+    feed_domains: set[str]
+    articles_by_url: dict[str, list[dict[str, Any]]]
+    cve_to_groups: dict[str, list[int]]
+    interest_keywords_lower: tuple[str, ...]
+
+
+def precompute_classifier_index(
+    feeds_config: list[dict[str, str]],
+    articles_fetched: list[dict[str, Any]],
+    groups_deduped: list[list[dict[str, Any]]],
+    config: dict[str, Any],
+) -> ClassifierIndex:
+    """原因推定用のインデックスを構築する。
+
+    Parameters
+    ----------
+    feeds_config : list[dict[str, str]]
+        設定されたフィード一覧。
+    articles_fetched : list[dict[str, Any]]
+        フィードから取得した記事一覧。
+    groups_deduped : list[list[dict[str, Any]]]
+        dedup.deduplicate により生成された重複排除後グループ。
+    config : dict[str, Any]
+        全体設定（``interest_keywords`` を参照する）。
+
+    Returns
+    -------
+    ClassifierIndex
+        フィードのドメイン集合、正規化URLから取得記事への逆引き、
+        CVE ID からグループ番号（昇順）への逆引き、小文字化済みの興味キーワード。
+    """
+    articles_by_url: dict[str, list[dict[str, Any]]] = {}
+    for art in articles_fetched or []:
+        if art.get("url"):
+            articles_by_url.setdefault(_url_norm(art["url"]), []).append(art)
+
+    cve_to_groups: dict[str, list[int]] = {}
+    for gi, group in enumerate(groups_deduped or []):
+        group_cves: set[str] = set()
+        for a in group:
+            group_cves |= dedup.extract_cves(a.get("title", "") + " " + a.get("summary", ""))
+        for cve in group_cves:
+            cve_to_groups.setdefault(cve, []).append(gi)
+    return ClassifierIndex(
+        feed_domains=_domains_from_feeds(feeds_config),
+        articles_by_url=articles_by_url,
+        cve_to_groups=cve_to_groups,
+        interest_keywords_lower=tuple(k.lower() for k in _parse_interest_keywords(config)),
+    )
+
+
+def classify_gaps(
+    gaps: list[dict[str, Any]],
+    feeds_config: list[dict[str, str]],
+    articles_fetched: list[dict[str, Any]],
+    groups_deduped: list[list[dict[str, Any]]],
+    config: dict[str, Any],
+) -> list[dict[str, str]]:
+    """複数ギャップの原因をまとめて推定する。
+
+    インデックスを一度だけ構築し、各ギャップの推定で共有する。
+
+    Parameters
+    ----------
+    gaps : list[dict[str, Any]]
+        ギャップ一覧。
+    feeds_config : list[dict[str, str]]
+        設定されたフィード一覧。
+    articles_fetched : list[dict[str, Any]]
+        フィードから取得した記事一覧。
+    groups_deduped : list[list[dict[str, Any]]]
+        重複排除後グループ。
+    config : dict[str, Any]
+        全体設定。
+
+    Returns
+    -------
+    list[dict[str, str]]
+        ``gaps`` と同じ順序の原因推定結果。
+    """
+    index = precompute_classifier_index(feeds_config, articles_fetched, groups_deduped, config)
+    return [classify_gap_cause(g, feeds_config, articles_fetched, groups_deduped, config, index=index) for g in gaps]
 
 
 def classify_gap_cause(
@@ -160,6 +269,7 @@ def classify_gap_cause(
     articles_fetched: list[dict[str, Any]],
     groups_deduped: list[list[dict[str, Any]]],
     config: dict[str, Any],
+    index: ClassifierIndex | None = None,
 ) -> dict[str, str]:
     """ギャップ（未掲載記事）の原因を推定する。
 
@@ -175,6 +285,8 @@ def classify_gap_cause(
         dedup.deduplicate により生成された重複排除後グループ。
     config : dict[str, Any]
         全体設定。
+    index : ClassifierIndex or None
+        ``precompute_classifier_index`` の結果。``None`` の場合はその場で構築する。
 
     Returns
     -------
@@ -190,12 +302,15 @@ def classify_gap_cause(
     gap_title = str(gap.get("title", ""))
     gap_domain = _extract_domain(gap_url)
 
-    feed_domains = _domains_from_feeds(feeds_config)
+    if index is None:
+        index = precompute_classifier_index(feeds_config, articles_fetched, groups_deduped, config)
+    same_url_articles = index.articles_by_url.get(_url_norm(gap_url), []) if gap_url else []
+
     window_days = int(config.get("window_days", 3) or 3)
     cutoff = datetime.now(UTC) - timedelta(days=window_days)
 
     # 1) feed_missing
-    if gap_domain and gap_domain not in feed_domains:
+    if gap_domain and gap_domain not in index.feed_domains:
         return {
             "cause": "feed_missing",
             "detail": f"参照記事のドメイン({gap_domain})が設定されたRSSフィード群に含まれていない可能性が高い。",
@@ -209,38 +324,32 @@ def classify_gap_cause(
         }
 
     # 2) outside_window（取得済み記事に存在するが期間外の公開日）
-    for art in articles_fetched or []:
-        if gap_url and _url_norm(art.get("url", "")) == _url_norm(gap_url):
-            published = art.get("published")
-            if published and published < cutoff:
-                return {
-                    "cause": "outside_window",
-                    "detail": (
-                        f"同一URLの記事が存在するが、公開日({published.isoformat()})が時間窓(window_days={window_days})の外。"
-                    ),
-                    "suggestion": "config.yamlのwindow_daysを拡大する（例: 3→7）。",
-                }
+    for art in same_url_articles:
+        published = art.get("published")
+        if published and published < cutoff:
+            return {
+                "cause": "outside_window",
+                "detail": (
+                    f"同一URLの記事が存在するが、公開日({published.isoformat()})が時間窓(window_days={window_days})の外。"
+                ),
+                "suggestion": "config.yamlのwindow_daysを拡大する（例: 3→7）。",
+            }
 
     # 3) dedup_merged（同一CVEなどで別記事に吸収されている可能性）
     gap_cves = dedup.extract_cves(gap_title)
-    if gap_cves:
-        for group in groups_deduped or []:
-            group_cves: set[str] = set()
-            for a in group:
-                group_cves |= dedup.extract_cves(a.get("title", "") + " " + a.get("summary", ""))
-            if group_cves and (gap_cves & group_cves):
-                rep = group[0]
-                return {
-                    "cause": "dedup_merged",
-                    "detail": (
-                        f"CVEが一致するため、別記事グループ（代表: {rep.get('title', '')[:80]}）"
-                        "へ統合されている可能性。"
-                    ),
-                    "suggestion": "重複排除の類似度閾値（dedup.titles_similar）やCVE統合ルールを見直す。",
-                }
+    merged_into = [gi for cve in gap_cves for gi in index.cve_to_groups.get(cve, ())]
+    if merged_into:
+        rep = groups_deduped[min(merged_into)][0]
+        return {
+            "cause": "dedup_merged",
+            "detail": (
+                f"CVEが一致するため、別記事グループ（代表: {rep.get('title', '')[:80]}）へ統合されている可能性。"
+            ),
+            "suggestion": "重複排除の類似度閾値（dedup.titles_similar）やCVE統合ルールを見直す。",
+        }
 
     # 4) interest_filtered
-    keywords = _parse_interest_keywords(config)
+    keywords = index.interest_keywords_lower
     if keywords and not _matches_interest(gap_title, keywords):
         return {
             "cause": "interest_filtered",
@@ -249,13 +358,12 @@ def classify_gap_cause(
         }
 
     # 5) low_rank（取得はできているが最終出力に含まれない）
-    for art in articles_fetched or []:
-        if gap_url and _url_norm(art.get("url", "")) == _url_norm(gap_url):
-            return {
-                "cause": "low_rank",
-                "detail": "記事は取得できているが、グルーピング/ランク付け/要約後の出力に反映されていない可能性。",
-                "suggestion": "trusted_sourcesの追加やランク付けロジックの調整を検討する。",
-            }
+    if same_url_articles:
+        return {
+            "cause": "low_rank",
+            "detail": "記事は取得できているが、グルーピング/ランク付け/要約後の出力に反映されていない可能性。",
+            "suggestion": "trusted_sourcesの追加やランク付けロジックの調整を検討する。",
+        }
 
     return {
         "cause": "unknown",
@@ -609,6 +717,13 @@ def interactive_session(gaps: list[dict[str, Any]], suggestions: str, config: di
             continue
 
 
+_DIGEST_ENTRY_RE = re.compile(
+    r"^(?:### (?P<title>.*)|[^\S\n]*-[^\S\n]*<(?P<url>https?://[^>\n]+)>)",
+    re.MULTILINE,
+)
+_DIGEST_LINK_RE = re.compile(r"<(?P<url>https?://[^>]+)>")
+
+
 def parse_digest_markdown(path: str) -> list[dict[str, str]]:
     """ダイジェストMarkdownから記事タイトルとURLを抽出する。
 
@@ -636,21 +751,18 @@ def parse_digest_markdown(path: str) -> list[dict[str, str]]:
     cur_title: str | None = None
     out: list[dict[str, str]] = []
 
-    url_re = re.compile(r"^-\s*<(?P<url>https?://[^>]+)>")
-
-    for line in text.splitlines():
-        if line.startswith("### "):
-            cur_title = line[4:].strip()
-            continue
-        m = url_re.match(line.strip())
-        if m and cur_title:
+    # 見出し行とURL行を1回の走査で拾う
+    for m in _DIGEST_ENTRY_RE.finditer(text):
+        title = m.group("title")
+        if title is not None:
+            cur_title = title.strip()
+        elif cur_title:
             out.append({"title": cur_title, "url": m.group("url")})
 
     # タイトルはあるがURLが無い記事も念のため保持
     if not out:
         # fallback: plain links
-        link_re = re.compile(r"<(?P<url>https?://[^>]+)>")
-        for m in link_re.finditer(text):
+        for m in _DIGEST_LINK_RE.finditer(text):
             out.append({"title": m.group("url"), "url": m.group("url")})
 
     return out
@@ -0,0 +1,218 @@
+"""ローカルキャッシュの保存先とJSON入出力を提供するモジュール。"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:  # orjson未導入時は標準ライブラリのjsonを使う
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
+CACHE_DIR_ENV = "SECURITY_NEWS_DIGEST_CACHE_DIR"
+
+
+def cache_dir(subdir: str = "") -> Path:
+    """キャッシュディレクトリのパスを返す。存在しない場合は作成する。
+
+    Parameters
+    ----------
+    subdir : str
+        キャッシュ種別ごとのサブディレクトリ名。空文字列の場合はルートを返す。
+
+    Returns
+    -------
+    Path
+        キャッシュディレクトリのパス。
+
+    Notes
+    -----
+    ルートは環境変数 ``SECURITY_NEWS_DIGEST_CACHE_DIR``、``$XDG_CACHE_HOME/security-news-digest``、
+    ``~/.cache/security-news-digest`` の順に決定する。
+    """
+    root = os.environ.get(CACHE_DIR_ENV)
+    if not root:
+        xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(xdg, "security-news-digest")
+    path = Path(root) / subdir if subdir else Path(root)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cache_key(text: str) -> str:
+    """任意の文字列からファイル名に使えるキャッシュキーを生成する。
+
+    Parameters
+    ----------
+    text : str
+        キーの元になる文字列（URLなど）。
+
+    Returns
+    -------
+    str
+        SHA-1の16進文字列。
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def load_json(path: Path) -> Any | None:
+    """JSONキャッシュを読み込む。
+
+    Parameters
+    ----------
+    path : Path
+        キャッシュファイルのパス。
+
+    Returns
+    -------
+    Any or None
+        読み込んだ値。ファイルが無い・壊れている場合は ``None``。
+    """
+    try:
+        with open(path, "rb") as f:
+            return _loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def save_json(path: Path, obj: Any) -> None:
+    """JSONキャッシュを書き込む。
+
+    書き込み途中のファイルを読まれないよう、一時ファイルに書いてから置き換える。
+    書き込みに失敗してもキャッシュは必須ではないため、警告のみ出して処理を続ける。
+
+    Parameters
+    ----------
+    path : Path
+        キャッシュファイルのパス。
+    obj : Any
+        JSONシリアライズ可能な値。
+    """
+    try:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps(obj))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Failed to write cache '{path}': {e}")
+
+
+class SQLiteCache:
+    """有効期限付きのキー・値キャッシュ（SQLite）。
+
+    値はJSONとして保存する。``with`` で使うと終了時に接続を閉じる。
+    値にはタグ（例: CVE ID）を付けられ、``values_with_tags`` で索引から該当する値だけを取り出せる。
+    開くたびに有効期限切れの値を削除し、ファイルが際限なく大きくならないようにする。
+
+    Parameters
+    ----------
+    path : Path
+        データベースファイルのパス。
+    ttl_seconds : float
+        値の有効期間（秒）。これより古い値は返さず、次に開いたときに削除する。
+
+    Raises
+    ------
+    sqlite3.Error
+        データベースを開けない場合。
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._conn = sqlite3.connect(path)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_tag (tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_tag_key ON cache_tag (key)")
+            expired_at = time.time() - ttl_seconds
+            self._conn.execute(
+                "DELETE FROM cache_tag WHERE key IN (SELECT key FROM cache WHERE created_at < ?)", (expired_at,)
+            )
+            self._conn.execute("DELETE FROM cache WHERE created_at < ?", (expired_at,))
+
+    def __enter__(self) -> "SQLiteCache":
+        """自身を返す。"""
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """接続を閉じる。"""
+        self.close()
+
+    def values_with_tags(self, tags: Iterable[str]) -> list[Any]:
+        """``tags`` のいずれかが付いた有効期限内の値を返す。
+
+        Parameters
+        ----------
+        tags : Iterable[str]
+            検索するタグ。
+
+        Returns
+        -------
+        list[Any]
+            該当する値。同じ値は1回だけ含む。
+        """
+        tags = sorted(set(tags))
+        since = time.time() - self.ttl_seconds
+        raws: dict[str, bytes] = {}
+        # SQLiteのプレースホルダ数の上限を超えないよう、タグを分割して問い合わせる
+        for start in range(0, len(tags), 500):
+            chunk = tags[start : start + 500]
+            rows = self._conn.execute(
+                "SELECT c.key, c.value FROM cache_tag t JOIN cache c ON c.key = t.key "
+                f"WHERE t.tag IN ({', '.join('?' * len(chunk))}) AND c.created_at >= ?",
+                (*chunk, since),
+            )
+            raws.update(rows)
+        values = []
+        for raw in raws.values():
+            try:
+                values.append(_loads(raw))
+            except ValueError:
+                continue
+        return values
+
+    def get(self, key: str) -> Any | None:
+        """有効期限内の値を返す。無い場合は ``None``。"""
+        row = self._conn.execute(
+            "SELECT value FROM cache WHERE key = ? AND created_at >= ?", (key, time.time() - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return _loads(row[0])
+        except ValueError:
+            return None
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        """値を保存する（同じキーは値・タグとも上書き）。"""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, _dumps(value), time.time()),
+            )
+            self._conn.execute("DELETE FROM cache_tag WHERE key = ?", (key,))
+            self._conn.executemany("INSERT INTO cache_tag (tag, key) VALUES (?, ?)", ((t, key) for t in set(tags)))
+
+    def close(self) -> None:
+        """接続を閉じる。"""
+        self._conn.close()
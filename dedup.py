@@ -2,8 +2,16 @@
 
 import re
 from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Any
 
+try:
+    from rapidfuzz import fuzz as _fuzz
+    from rapidfuzz import process as _process
+except ImportError:  # rapidfuzz未導入時はdifflibで判定する
+    _fuzz = None
+    _process = None
+
 CVE_PATTERN = re.compile(r"CVE-\d{4}-\d{4,7}", re.IGNORECASE)
 
 SOURCE_SUFFIXES = [
@@ -19,10 +27,19 @@ SOURCE_SUFFIXES = [
     " | BleepingComputer",
 ]
 
+_TOKEN_RE = re.compile(r"\w+")
+_BLOCK_STOPWORDS = frozenset({"the", "and", "for", "with", "from", "new", "via", "are", "has", "its", "how", "after"})
+
+_SUFFIX_RE = re.compile("(?:" + "|".join(re.escape(s) for s in SOURCE_SUFFIXES) + r")+\Z")
+_BRACKET_PREFIX_RE = re.compile(r"^\[.*?\]\s*")
 
-def extract_cves(text: str) -> set:
+
+@lru_cache(maxsize=8192)
+def extract_cves(text: str) -> frozenset[str]:
     """テキストからすべてのCVE IDを抽出する。
 
+    同一テキストに対する再計算を避けるため結果をキャッシュする。
+
     Parameters
     ----------
     text : str
@@ -30,15 +47,18 @@ def extract_cves(text: str) -> set:
 
     Returns
     -------
-    set
-        抽出されたCVE IDの文字列セット。
+    frozenset[str]
+        抽出されたCVE IDの文字列セット（キャッシュ共有のため不変）。
     """
-    return set(CVE_PATTERN.findall(text.upper()))
+    return frozenset(m.upper() for m in CVE_PATTERN.findall(text))
 
 
+@lru_cache(maxsize=8192)
 def normalize_title(title: str) -> str:
     """タイトルを正規化して比較可能にする。
 
+    同一タイトルに対する再計算を避けるため結果をキャッシュする。
+
     Parameters
     ----------
     title : str
@@ -49,17 +69,17 @@ def normalize_title(title: str) -> str:
     str
         小文字化・サフィックス除去・プレフィックス除去された正規化タイトル。
     """
-    t = title.strip()
-    for suffix in SOURCE_SUFFIXES:
-        if t.endswith(suffix):
-            t = t[: -len(suffix)]
-    t = re.sub(r"^\[.*?\]\s*", "", t)
+    t = _SUFFIX_RE.sub("", title.strip())
+    t = _BRACKET_PREFIX_RE.sub("", t)
     return t.lower().strip()
 
 
 def titles_similar(a: str, b: str, threshold: float = 0.75) -> bool:
     """2つの正規化タイトルの類似度を判定する。
 
+    rapidfuzz がインストールされていればC++実装の ``fuzz.ratio`` を、
+    なければ ``difflib.SequenceMatcher`` を用いる。
+
     Parameters
     ----------
     a : str
@@ -74,13 +94,168 @@ def titles_similar(a: str, b: str, threshold: float = 0.75) -> bool:
     bool
         類似度が閾値以上の場合 ``True``。
     """
-    return SequenceMatcher(None, a, b).ratio() >= threshold
+    if _fuzz is not None:
+        cutoff = threshold * 100
+        return _fuzz.ratio(a, b, score_cutoff=cutoff) >= cutoff
+    return _ratio_at_least(SequenceMatcher(None, a, b), threshold)
+
+
+def title_block_keys(norm_title: str) -> set[str]:
+    """類似度比較の候補を絞り込むためのブロッキングキーを返す。
+
+    キーを1つも共有しないタイトル同士は比較しない。英数字の語は先頭3文字
+    （短い語・一般語は除外）、日本語などの非ASCII語は文字バイグラムをキーとする。
+    キーが得られない場合はタイトル全体をキーとする。
+
+    Parameters
+    ----------
+    norm_title : str
+        正規化済みタイトル。
+
+    Returns
+    -------
+    set[str]
+        ブロッキングキーの集合。
+    """
+    keys: set[str] = set()
+    for tok in _TOKEN_RE.findall(norm_title):
+        if tok.isascii():
+            if len(tok) >= 3 and tok not in _BLOCK_STOPWORDS:
+                keys.add(tok[:3])
+        else:
+            keys.update(tok[k : k + 2] for k in range(len(tok) - 1))
+    return keys or {norm_title}
+
+
+def _ratio_at_least(sm: SequenceMatcher, threshold: float) -> bool:
+    """上限値による枝刈りを行いつつ ``ratio() >= threshold`` を判定する。
+
+    ``real_quick_ratio`` （長さのみ）と ``quick_ratio`` （文字の多重集合）は
+    ``ratio`` の上限値なので、これらが閾値未満なら一致ブロック計算を省略できる。
+    """
+    return sm.real_quick_ratio() >= threshold and sm.quick_ratio() >= threshold and sm.ratio() >= threshold
+
+
+class TitleMatcher:
+    """基準タイトルを固定して複数の候補タイトルとの類似度を判定する。
+
+    ``SequenceMatcher`` は seq2 側の索引（``b2j``）の構築コストが大きいため、
+    基準タイトルを seq2 に固定し、候補ごとに ``set_seq1`` のみを差し替える。
+    rapidfuzz が利用可能な場合は ``titles_similar`` と同じく ``fuzz.ratio`` で判定する。
+
+    Parameters
+    ----------
+    reference : str
+        比較基準の正規化タイトル。
+    threshold : float
+        類似度の閾値。デフォルトは0.75。
+    """
+
+    def __init__(self, reference: str, threshold: float = 0.75) -> None:
+        self.reference = reference
+        self.threshold = threshold
+        self._sm: SequenceMatcher | None = None
+        if _fuzz is None:
+            self._sm = SequenceMatcher(None)
+            self._sm.set_seq2(reference)
+
+    def similar(self, candidate: str) -> bool:
+        """候補タイトルが基準タイトルと類似しているかを判定する。
+
+        Parameters
+        ----------
+        candidate : str
+            比較する正規化タイトル。
+
+        Returns
+        -------
+        bool
+            類似度が閾値以上の場合 ``True``。
+        """
+        if self._sm is None:
+            cutoff = self.threshold * 100
+            return _fuzz.ratio(candidate, self.reference, score_cutoff=cutoff) >= cutoff
+        self._sm.set_seq1(candidate)
+        return _ratio_at_least(self._sm, self.threshold)
+
+
+def match_any(queries: list[str], choices: list[str], threshold: float = 0.75) -> list[bool]:
+    """各クエリタイトルに類似する候補タイトルが存在するかを一括判定する。
+
+    rapidfuzz が利用可能な場合は ``process.extractOne`` で候補全体の走査を
+    ネイティブコード内で行う。それ以外は ``title_block_keys`` で絞り込んだ候補のみを
+    ``TitleMatcher`` で比較する。空文字列はどのタイトルとも一致しないものとして扱う。
+
+    Parameters
+    ----------
+    queries : list[str]
+        判定対象の正規化タイトル。
+    choices : list[str]
+        比較先の正規化タイトル。
+    threshold : float
+        類似度の閾値。デフォルトは0.75。
+
+    Returns
+    -------
+    list[bool]
+        ``queries`` と同じ順序の判定結果。
+    """
+    choices = [c for c in choices if c]
+    if _process is not None:
+        cutoff = threshold * 100
+        return [
+            bool(q) and _process.extractOne(q, choices, scorer=_fuzz.ratio, score_cutoff=cutoff) is not None
+            for q in queries
+        ]
+
+    buckets: dict[str, list[int]] = {}
+    for idx, c in enumerate(choices):
+        for key in title_block_keys(c):
+            buckets.setdefault(key, []).append(idx)
+
+    results = []
+    for q in queries:
+        matched = False
+        if q:
+            matcher = TitleMatcher(q, threshold)
+            candidates = {idx for key in title_block_keys(q) for idx in buckets.get(key, ())}
+            matched = any(matcher.similar(choices[idx]) for idx in sorted(candidates))
+        results.append(matched)
+    return results
+
+
+class _DisjointSet:
+    """記事インデックスの素集合（Union-Find）。
+
+    根は常に集合内の最小インデックスとなるため、根の順序が初出順に一致する。
+    """
+
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        """``x`` が属する集合の根を返す（経路圧縮あり）。"""
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, x: int, y: int) -> None:
+        """``x`` と ``y`` の集合を併合する。"""
+        rx, ry = self.find(x), self.find(y)
+        if rx < ry:
+            self.parent[ry] = rx
+        elif ry < rx:
+            self.parent[rx] = ry
 
 
 def deduplicate(articles: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
     """重複記事をグルーピングする。
 
     URL一致、共通CVE、タイトル類似度の3つの基準で記事をグループ化する。
+    一致関係は推移的に扱う（AとBがURL一致、BとCがCVE一致なら同一グループ）。
     各グループの先頭が代表記事となる。
 
     Parameters
@@ -91,43 +266,38 @@ def deduplicate(articles: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
     Returns
     -------
     list[list[dict[str, Any]]]
-        グループ化された記事リストのリスト。
+        グループ化された記事リストのリスト。グループと各グループ内の記事は初出順。
     """
-    groups: list[list[dict[str, Any]]] = []
-    used = [False] * len(articles)
+    n = len(articles)
+    cves = [extract_cves(a["title"] + " " + a.get("summary", "")) for a in articles]
+    norms = [normalize_title(a["title"]) for a in articles]
+    dsu = _DisjointSet(n)
 
-    for i, art in enumerate(articles):
-        if used[i]:
+    # URL・CVEは完全一致で判定できるため、キーごとの初出記事へ併合する
+    first_by_key: dict[str, int] = {}
+    for idx, art in enumerate(articles):
+        if art["url"]:
+            dsu.union(first_by_key.setdefault("url:" + art["url"], idx), idx)
+        for cve in cves[idx]:
+            dsu.union(first_by_key.setdefault(cve, idx), idx)
+
+    # ブロッキングキーを共有する別グループの記事のみタイトル類似度で比較する
+    block_keys = [title_block_keys(norm) for norm in norms]
+    buckets: dict[str, list[int]] = {}
+    for idx, keys in enumerate(block_keys):
+        for key in keys:
+            buckets.setdefault(key, []).append(idx)
+
+    for i in range(n):
+        candidates = {j for key in block_keys[i] for j in buckets[key] if j > i}
+        if not candidates:
             continue
-        group = [art]
-        used[i] = True
-
-        url_i = art["url"]
-        cves_i = extract_cves(art["title"] + " " + art.get("summary", ""))
-        norm_i = normalize_title(art["title"])
-
-        for j in range(i + 1, len(articles)):
-            if used[j]:
-                continue
-            other = articles[j]
-
-            if url_i and url_i == other["url"]:
-                group.append(other)
-                used[j] = True
-                continue
-
-            cves_j = extract_cves(other["title"] + " " + other.get("summary", ""))
-            if cves_i and cves_j and cves_i & cves_j:
-                group.append(other)
-                used[j] = True
-                continue
-
-            norm_j = normalize_title(other["title"])
-            if titles_similar(norm_i, norm_j):
-                group.append(other)
-                used[j] = True
-                continue
-
-        groups.append(group)
-
-    return groups
+        matcher = TitleMatcher(norms[i])
+        for j in candidates:
+            if dsu.find(i) != dsu.find(j) and matcher.similar(norms[j]):
+                dsu.union(i, j)
+
+    members: dict[int, list[dict[str, Any]]] = {}
+    for idx, art in enumerate(articles):
+        members.setdefault(dsu.find(idx), []).append(art)
+    return list(members.values())
@@ -1,13 +1,33 @@
 """RSSフィードの取得とパースを行うモジュール。"""
 
+import calendar
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
 from typing import Any
+from urllib.parse import urlsplit
 
 import feedparser
+import requests
 from dateutil import parser as dateparser
+from requests.adapters import HTTPAdapter
 
+import cache
 
-def fetch_feeds(feeds_config: list[dict[str, str]], window_days: int = 3) -> list[dict[str, Any]]:
+# 同一ホストの複数フィードで接続を使い回すため、HTTPセッションはモジュールで共有する
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "security-news-digest/1.0"
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# 同一ホストへ同時に送るリクエスト数の上限（相手サーバへの負荷を抑えるため）
+MAX_REQUESTS_PER_HOST = 4
+_HOST_SLOTS: dict[str, threading.BoundedSemaphore] = {}
+_HOST_SLOTS_LOCK = threading.Lock()
+
+
+def fetch_feeds(feeds_config: list[dict[str, str]], window_days: int = 3, max_workers: int = 8) -> list[dict[str, Any]]:
     """設定されたRSSフィードから指定期間内の記事を取得する。
 
     Parameters
@@ -16,48 +36,198 @@ def fetch_feeds(feeds_config: list[dict[str, str]], window_days: int = 3) -> lis
         フィード設定のリスト。各辞書は ``name``, ``url``, ``lang`` キーを持つ。
     window_days : int
         取得する過去日数。デフォルトは3日。
+    max_workers : int
+        並列に取得するフィード数の上限。デフォルトは8。
 
     Returns
     -------
     list[dict[str, Any]]
-        取得した記事の辞書リスト。
+        取得した記事の辞書リスト。フィードの設定順に並ぶ。
     """
     cutoff = datetime.now(UTC) - timedelta(days=window_days)
-    articles = []
+    articles: list[dict[str, Any]] = []
+    if not feeds_config:
+        return articles
 
-    for feed_cfg in feeds_config:
-        name = feed_cfg["name"]
-        url = feed_cfg["url"]
-        lang = feed_cfg.get("lang", "en")
+    # 取得はネットワーク待ちが支配的なため並列に行い、結果は設定順に連結する
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(feeds_config)))) as executor:
+        for feed_articles in executor.map(lambda cfg: _fetch_one(cfg, cutoff), feeds_config):
+            articles.extend(feed_articles)
 
-        try:
-            parsed = feedparser.parse(url)
-        except Exception as e:
-            print(f"[WARN] Failed to fetch feed '{name}': {e}")
-            continue
+    return articles
 
-        for entry in parsed.entries:
-            published = _parse_date(entry)
-            if published and published < cutoff:
-                continue
-
-            article = {
-                "title": entry.get("title", "").strip(),
-                "url": entry.get("link", "").strip(),
-                "summary": entry.get("summary", "").strip(),
-                "published": published,
-                "source_feed": name,
-                "lang": lang,
-                "source_name": _extract_source(entry),
-            }
-            articles.append(article)
 
-    return articles
+def _fetch_one(feed_cfg: dict[str, str], cutoff: datetime) -> list[dict[str, Any]]:
+    """1つのフィードを取得し、期間内の記事を辞書に変換する。
+
+    Parameters
+    ----------
+    feed_cfg : dict[str, str]
+        フィード設定（``name``, ``url``, ``lang``）。
+    cutoff : datetime
+        これより古い記事を除外する基準日時。
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        記事の辞書リスト。取得に失敗した場合は警告を出して空リストを返す。
+    """
+    name = feed_cfg["name"]
+    lang = feed_cfg.get("lang", "en")
+
+    try:
+        records = _download_feed(feed_cfg["url"], cutoff)
+    except Exception as e:
+        print(f"[WARN] Failed to fetch feed '{name}': {e}")
+        return []
+
+    # フィード単位で共通の項目は1度だけ作り、各レコードに重ねる
+    base = {"source_feed": name, "lang": lang}
+    return [{**rec, **base} for rec in records if not (rec["published"] and rec["published"] < cutoff)]
+
+
+def _download_feed(url: str, cutoff: datetime) -> list[dict[str, Any]]:
+    """フィードを取得し、期間内のエントリを記事レコードに変換する。
+
+    HTTP(S)のフィードは共有セッションで取得し、ETag/Last-Modified による条件付きGETを行う。
+    304 (Not Modified) の場合はディスクキャッシュに保存済みのレコードを返す。
+    キャッシュは保存時の ``cutoff`` 以降のエントリしか持たないため、期間が広がった場合は
+    条件付きにせず取得し直す。
+
+    Parameters
+    ----------
+    url : str
+        フィードのURL。
+    cutoff : datetime
+        これより古いことが ``*_parsed`` から分かるエントリは変換せずに捨てる。
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        ``title``, ``url``, ``summary``, ``published``, ``source_name`` を持つレコードのリスト。
+
+    Raises
+    ------
+    requests.RequestException
+        HTTPエラーや接続失敗の場合。
+    """
+    cutoff_ts = cutoff.timestamp()
+    if not url.startswith(("http://", "https://")):
+        return [_entry_record(e) for e in feedparser.parse(url).entries if not _is_stale(e, cutoff_ts)]
+
+    try:
+        cache_path = cache.cache_dir("feeds") / f"{cache.cache_key(url)}.json"
+        cached = cache.load_json(cache_path)
+    except OSError:
+        cache_path, cached = None, None
+
+    request_headers = {}
+    if _cache_covers(cached, cutoff):
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("modified"):
+            request_headers["If-Modified-Since"] = cached["modified"]
+
+    with _host_slot(url):
+        resp = _SESSION.get(url, timeout=30, headers=request_headers)
+    if resp.status_code == 304 and request_headers:
+        return [_record_from_json(r) for r in cached["entries"]]
+    resp.raise_for_status()
+
+    # 文字コード判定と相対リンク解決のため、レスポンスヘッダを引き継ぐ
+    headers = {k.lower(): v for k, v in resp.headers.items()}
+    headers.setdefault("content-location", resp.url)
+    entries = feedparser.parse(resp.content, response_headers=headers).entries
+    records = [_entry_record(e) for e in entries if not _is_stale(e, cutoff_ts)]
+
+    if cache_path is not None and (headers.get("etag") or headers.get("last-modified")):
+        cache.save_json(
+            cache_path,
+            {
+                "etag": headers.get("etag"),
+                "modified": headers.get("last-modified"),
+                "cutoff": cutoff.isoformat(),
+                "entries": [_record_to_json(r) for r in records],
+            },
+        )
+    return records
+
+
+def _cache_covers(cached: Any, cutoff: datetime) -> bool:
+    """キャッシュが ``cutoff`` 以降のエントリをすべて含んでいるかを判定する。"""
+    if not isinstance(cached, dict) or "entries" not in cached:
+        return False
+    try:
+        return datetime.fromisoformat(cached["cutoff"]) <= cutoff
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def _is_stale(entry: Any, cutoff_ts: float) -> bool:
+    """feedparserが解析済みの日時だけを見て、エントリが期間外かを安く判定する。
+
+    ``_parse_date`` と同じ優先順で日付項目を見る。文字列の解析が必要な場合は判定せず
+    ``False`` を返し、期間の判定は ``_fetch_one`` に任せる。
+    """
+    for field in ("published", "updated", "created"):
+        parsed = entry.get(f"{field}_parsed")
+        if parsed:
+            return calendar.timegm(parsed) < cutoff_ts
+        if entry.get(field):
+            return False
+    return False
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    """URLのホストごとの同時接続数を制限するセマフォを返す。
+
+    Parameters
+    ----------
+    url : str
+        リクエスト先のURL。
+
+    Returns
+    -------
+    threading.BoundedSemaphore
+        ``with`` で取得・解放するセマフォ。同じホストには同じオブジェクトを返す。
+    """
+    host = urlsplit(url).netloc.lower()
+    with _HOST_SLOTS_LOCK:
+        slot = _HOST_SLOTS.get(host)
+        if slot is None:
+            slot = _HOST_SLOTS[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+    return slot
+
+
+def _entry_record(entry: Any) -> dict[str, Any]:
+    """feedparserのエントリを記事レコードに変換する。"""
+    return {
+        "title": entry.get("title", "").strip(),
+        "url": entry.get("link", "").strip(),
+        "summary": entry.get("summary", "").strip(),
+        "published": _parse_date(entry),
+        "source_name": _extract_source(entry),
+    }
+
+
+def _record_to_json(rec: dict[str, Any]) -> dict[str, Any]:
+    """記事レコードをJSON保存用に変換する（日時はISO 8601文字列）。"""
+    published = rec["published"]
+    return {**rec, "published": published.isoformat() if published else None}
+
+
+def _record_from_json(rec: dict[str, Any]) -> dict[str, Any]:
+    """JSONから読み込んだ記事レコードの日時を復元する。"""
+    published = rec.get("published")
+    return {**rec, "published": datetime.fromisoformat(published) if published else None}
 
 
 def _parse_date(entry: Any) -> datetime | None:
     """フィードエントリから公開日時をパースする。
 
+    feedparserが解析済みの ``*_parsed`` （UTCのstruct_time）があればそれを使い、
+    文字列の解析は ``_parse_date_string`` で行う。
+
     Parameters
     ----------
     entry : Any
@@ -69,15 +239,41 @@ def _parse_date(entry: Any) -> datetime | None:
         パースされた日時。パースできない場合は ``None``。
     """
     for field in ("published", "updated", "created"):
+        parsed = entry.get(f"{field}_parsed")
+        if parsed:
+            return datetime.fromtimestamp(calendar.timegm(parsed), UTC)
         val = entry.get(field)
         if val:
-            try:
-                dt = dateparser.parse(val)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=UTC)
+            dt = _parse_date_string(val)
+            if dt is not None:
                 return dt
-            except (ValueError, TypeError):
-                continue
+    return None
+
+
+def _parse_date_string(val: str) -> datetime | None:
+    """日付文字列を高速な形式から順に解析する。
+
+    RSSで一般的なRFC 2822形式は ``email.utils``、Atomで一般的なISO 8601形式は
+    ``datetime.fromisoformat`` で解析し、どちらにも該当しない場合のみ ``dateutil`` を使う。
+
+    Parameters
+    ----------
+    val : str
+        日付文字列。
+
+    Returns
+    -------
+    datetime or None
+        タイムゾーン付きの日時。タイムゾーンが無い場合はUTCとみなす。解析できない場合は ``None``。
+    """
+    for parse in (parsedate_to_datetime, datetime.fromisoformat, dateparser.parse):
+        try:
+            dt = parse(val)
+        except (ValueError, TypeError, OverflowError):
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=UTC)
+        return dt
     return None
 
 
@@ -100,10 +296,11 @@ def _extract_source(entry: Any) -> str:
         if title:
             return title
 
+    # 末尾の " - ソース名" を優先し、無ければ " | ソース名" を見る（rpartitionは1回の走査で済む）
     title = entry.get("title", "")
-    if " - " in title:
-        return title.rsplit(" - ", 1)[-1].strip()
-    if " | " in title:
-        return title.rsplit(" | ", 1)[-1].strip()
+    for sep in (" - ", " | "):
+        _, found, tail = title.rpartition(sep)
+        if found:
+            return tail.strip()
 
     return ""
@@ -1,6 +1,8 @@
 """要約済み記事をマークダウン形式に整形するモジュール。"""
 
+from collections.abc import Iterator
 from datetime import UTC, datetime
+from itertools import groupby, islice
 from typing import Any
 
 CATEGORY_HEADERS = {
@@ -11,68 +13,97 @@ CATEGORY_HEADERS = {
 }
 
 CATEGORY_ORDER = ["critical", "notable", "jp", "general"]
+CATEGORY_INDEX = {c: i for i, c in enumerate(CATEGORY_ORDER)}
 
 
-def format_digest(articles: list[dict[str, Any]], date_str: str | None = None) -> str:
+def format_digest(
+    articles: list[dict[str, Any]], date_str: str | None = None, max_per_category: int | None = None
+) -> str:
     """記事リストをマークダウンダイジェストに整形する。
 
+    ``iter_digest`` の出力を連結したもの。
+
     Parameters
     ----------
     articles : list[dict[str, Any]]
         要約済み記事の辞書リスト。
     date_str : str or None
         ダイジェストの日付文字列。``None`` の場合はUTC現在日付を使用。
+    max_per_category : int or None
+        カテゴリごとに掲載する最大件数（ソース数の多い順）。``None`` の場合は全件。
 
     Returns
     -------
     str
         マークダウン形式のダイジェスト文字列。
     """
+    return "\n".join(iter_digest(articles, date_str, max_per_category))
+
+
+def iter_digest(
+    articles: list[dict[str, Any]], date_str: str | None = None, max_per_category: int | None = None
+) -> Iterator[str]:
+    """マークダウンダイジェストを行（ブロック）単位で順に生成する。
+
+    Parameters
+    ----------
+    articles : list[dict[str, Any]]
+        要約済み記事の辞書リスト。
+    date_str : str or None
+        ダイジェストの日付文字列。``None`` の場合はUTC現在日付を使用。
+    max_per_category : int or None
+        カテゴリごとに掲載する最大件数（ソース数の多い順）。``None`` の場合は全件。
+
+    Yields
+    ------
+    str
+        改行を含まない1行、または1記事分の複数行ブロック。改行で連結するとダイジェスト全体になる。
+    """
+    now = datetime.now(UTC)
     if date_str is None:
-        date_str = datetime.now(UTC).strftime("%Y-%m-%d")
-
-    lines = [
-        f"# Security News Digest — {date_str}",
-        "",
-        f"Generated: {datetime.now(UTC).strftime('%Y-%m-%d %H:%M UTC')}",
-        f"Articles: {len(articles)}",
-        "",
-        "---",
-        "",
-    ]
-
-    by_cat: dict[str, list[dict[str, Any]]] = {c: [] for c in CATEGORY_ORDER}
-    for art in articles:
-        cat = art.get("category", "general")
-        if cat not in by_cat:
-            cat = "general"
-        by_cat[cat].append(art)
-
-    for cat in CATEGORY_ORDER:
-        items = by_cat[cat]
-        if not items:
-            continue
-
-        lines.append(f"## {CATEGORY_HEADERS[cat]}")
-        lines.append("")
-
-        items.sort(key=lambda x: x.get("source_count", 1), reverse=True)
+        date_str = now.strftime("%Y-%m-%d")
+
+    # カテゴリ順・ソース数の降順に1回だけソートし、カテゴリごとにまとめて出力する
+    general = CATEGORY_INDEX["general"]
 
+    def cat_index(art: dict[str, Any]) -> int:
+        return CATEGORY_INDEX.get(art.get("category", "general"), general)
+
+    ordered = sorted(articles, key=lambda a: (cat_index(a), -a.get("source_count", 1)))
+    if max_per_category is not None:
+        ordered = [a for _, items in groupby(ordered, key=cat_index) for a in islice(items, max_per_category)]
+
+    yield f"# Security News Digest — {date_str}"
+    yield ""
+    yield f"Generated: {now.strftime('%Y-%m-%d %H:%M UTC')}"
+    yield f"Articles: {len(ordered)}"
+    yield ""
+    yield "---"
+    yield ""
+
+    for idx, items in groupby(ordered, key=cat_index):
+        yield f"## {CATEGORY_HEADERS[CATEGORY_ORDER[idx]]}"
+        yield ""
         for art in items:
-            lines.append(f"### {art['title']}")
-            lines.append("")
-            if art.get("cves"):
-                lines.append(f"**CVE:** {', '.join(art['cves'])}")
-                lines.append("")
-            lines.append(art.get("summary", ""))
-            lines.append("")
-            if art.get("sources"):
-                lines.append(f"**Sources ({art.get('source_count', 1)}):** {', '.join(art['sources'])}")
-            if art.get("urls"):
-                for url in art["urls"][:3]:
-                    lines.append(f"- <{url}>")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-
-    return "\n".join(lines)
+            yield _format_article(art)
+
+
+def _format_article(art: dict[str, Any]) -> str:
+    """1記事分のマークダウンブロックを組み立てる。
+
+    Parameters
+    ----------
+    art : dict[str, Any]
+        要約済み記事の辞書。
+
+    Returns
+    -------
+    str
+        見出しから区切り線までの複数行文字列（末尾の空行を含む）。
+    """
+    cve_part = f"**CVE:** {', '.join(art['cves'])}\n\n" if art.get("cves") else ""
+    sources_part = (
+        f"**Sources ({art.get('source_count', 1)}):** {', '.join(art['sources'])}\n" if art.get("sources") else ""
+    )
+    urls_part = "".join(f"- <{url}>\n" for url in art["urls"][:3]) if art.get("urls") else ""
+    return f"### {art['title']}\n\n{cve_part}{art.get('summary', '')}\n\n{sources_part}{urls_part}\n---\n"
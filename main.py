@@ -12,7 +12,10 @@ Subcommands
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
+import re
 import sys
 from datetime import UTC, datetime
 from pathlib import Path
@@ -20,7 +23,7 @@ from pathlib import Path
 import yaml
 
 from analyzer import (
-    classify_gap_cause,
+    classify_gaps,
     fetch_reference,
     find_gaps,
     generate_suggestions,
@@ -29,8 +32,8 @@ from analyzer import (
 )
 from dedup import deduplicate
 from fetcher import fetch_feeds
-from formatter import format_digest
-from summarizer import summarize
+from formatter import iter_digest
+from summarizer import heuristic_entry, summarize, summarize_batch
 
 
 def load_feeds_file(path: str) -> list:
@@ -75,8 +78,9 @@ def load_config(config_path: str = "config.yaml") -> dict:
     dict
         設定内容の辞書。
     """
+    # libyamlが使える環境ではCローダーで解析する（意味はSafeLoaderと同じ）
     with open(config_path) as f:
-        cfg = yaml.safe_load(f)
+        cfg = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     if isinstance(cfg, dict):
         cfg["_config_path"] = config_path
     return cfg
@@ -98,19 +102,22 @@ def rank_groups(groups: list, trusted_sources: set) -> list:
 
 def filter_by_interests(groups: list, keywords: list) -> list:
     """興味キーワードに一致する記事グループのみをフィルタリングする。"""
+    if not keywords:
+        return []
+    # キーワードは1つの正規表現にまとめ、大文字小文字の違いはIGNORECASEで吸収する
+    pattern = re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
     filtered = []
-    kw_lower = [k.lower() for k in keywords]
     for group in groups:
-        text = " ".join((a["title"] + " " + a.get("summary", "")).lower() for a in group)
-        if any(kw in text for kw in kw_lower):
+        if any(pattern.search(a["title"]) or pattern.search(a.get("summary", "")) for a in group):
             filtered.append(group)
     return filtered
 
 
-def _write_digest(results: list[dict], config: dict, output_dir_override: str | None) -> str:
+def _write_digest(
+    results: list[dict], config: dict, output_dir_override: str | None, print_digest: bool = False
+) -> str:
     """ダイジェストをファイルへ書き出し、出力パスを返す。"""
     date_str = datetime.now(UTC).strftime("%Y-%m-%d")
-    digest = format_digest(results, date_str)
 
     out_dir = output_dir_override or config.get("output", {}).get("directory", "output")
     Path(out_dir).mkdir(parents=True, exist_ok=True)
@@ -118,14 +125,45 @@ def _write_digest(results: list[dict], config: dict, output_dir_override: str |
     filename = template.replace("{date}", date_str)
     out_path = os.path.join(out_dir, filename)
 
+    # 内容が前回と同じなら書き直さない（Generated行の時刻だけが変わる再実行を避ける）
+    max_per_category = config.get("output", {}).get("max_per_category")
+    sig = _digest_signature(results, date_str, max_per_category)
+    sig_path = out_path + ".sig"
+    if os.path.exists(out_path) and _read_text(sig_path) == sig:
+        if print_digest:
+            with open(out_path) as f:
+                sys.stdout.write(f.read())
+        print(f"\n[*] Digest unchanged: {out_path}")
+        return out_path
+
+    # 全体を1つの文字列にせず、生成したそばからファイルへ書き出す
     with open(out_path, "w") as f:
-        f.write(digest)
+        f.writelines(line + "\n" for line in iter_digest(results, date_str, max_per_category))
+    with open(sig_path, "w") as f:
+        f.write(sig)
 
-    print(digest)
+    if print_digest:
+        with open(out_path) as f:
+            sys.stdout.write(f.read())
     print(f"\n[*] Digest written to {out_path}")
     return out_path
 
 
+def _digest_signature(results: list[dict], date_str: str, max_per_category: int | None) -> str:
+    """ダイジェストの内容を表すハッシュ値を返す。"""
+    payload = json.dumps([date_str, max_per_category, results], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_text(path: str) -> str | None:
+    """テキストファイルを読み込む。読めない場合は ``None`` を返す。"""
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
 def _latest_digest_file(config: dict) -> str | None:
     """output/ 内の最新ダイジェストMarkdownを返す。"""
     out_dir = config.get("output", {}).get("directory", "output")
@@ -144,7 +182,7 @@ def run_digest(args: argparse.Namespace) -> int:
         config["feeds"] = load_feeds_file(args.feeds_file)
 
     print("[*] Fetching feeds...")
-    articles = fetch_feeds(config["feeds"], config.get("window_days", 3))
+    articles = fetch_feeds(config["feeds"], config.get("window_days", 3), config.get("fetch_workers", 8))
     print(f"    Fetched {len(articles)} articles")
 
     if not articles:
@@ -165,38 +203,12 @@ def run_digest(args: argparse.Namespace) -> int:
 
     if args.no_llm:
         print("[*] Skipping LLM (heuristic mode)...")
-        import dedup as dedup_mod
-        from summarizer import _guess_category
-
-        results = []
-        for group in groups:
-            rep = group[0]
-            all_cves: set = set()
-            all_sources: set = set()
-            all_urls: list = []
-            for a in group:
-                all_cves |= dedup_mod.extract_cves(a["title"] + " " + a.get("summary", ""))
-                if a.get("source_name"):
-                    all_sources.add(a["source_name"])
-                if a["url"]:
-                    all_urls.append(a["url"])
-            results.append(
-                {
-                    "title": rep["title"],
-                    "summary": rep.get("summary", ""),
-                    "category": _guess_category(group, rep),
-                    "sources": list(all_sources),
-                    "urls": list(set(all_urls)),
-                    "cves": list(all_cves),
-                    "source_count": len(group),
-                    "lang": rep.get("lang", "en"),
-                }
-            )
+        results = [heuristic_entry(group) for group in groups]
     else:
         print("[*] Summarizing with LLM...")
-        results = summarize(groups, config["llm"])
+        results = summarize_batch(groups, config["llm"]) if args.batch else summarize(groups, config["llm"])
 
-    _write_digest(results, config, args.output_dir)
+    _write_digest(results, config, args.output_dir, args.print)
     return 0
 
 
@@ -205,7 +217,7 @@ def run_analyze_gap(args: argparse.Namespace) -> int:
     config = load_config(args.config)
 
     print("[*] Fetching feeds (for analysis)...")
-    articles = fetch_feeds(config["feeds"], config.get("window_days", 3))
+    articles = fetch_feeds(config["feeds"], config.get("window_days", 3), config.get("fetch_workers", 8))
     print(f"    Fetched {len(articles)} articles")
 
     print("[*] Deduplicating (for analysis)...")
@@ -232,8 +244,9 @@ def run_analyze_gap(args: argparse.Namespace) -> int:
     print(f"    Gaps: {len(gaps)}")
 
     print("[*] Classifying gap causes...")
-    for g in gaps:
-        g["cause_info"] = classify_gap_cause(g, config.get("feeds", []), articles, groups, config)
+    causes = classify_gaps(gaps, config.get("feeds", []), articles, groups, config)
+    for g, cause_info in zip(gaps, causes, strict=True):
+        g["cause_info"] = cause_info
 
     llm_cfg = {} if args.no_llm else config.get("llm", {})
     print("[*] Generating suggestions...")
@@ -266,7 +279,13 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip LLM summarization (use heuristics only)",
     )
+    p_digest.add_argument(
+        "--batch",
+        action="store_true",
+        help="Summarize uncached groups via the Batch API (half price, may take up to 24h)",
+    )
     p_digest.add_argument("--output-dir", default=None, help="Override output directory")
+    p_digest.add_argument("--print", action="store_true", help="Also print the digest to stdout")
     p_digest.add_argument(
         "--feeds-file",
         default=None,
@@ -1,12 +1,20 @@
 """LLMを用いた要約・カテゴリ分類モジュール。フォールバック機能付き。"""
 
+import asyncio
+import hashlib
 import json
 import os
 import re
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from importlib.util import find_spec
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI, Timeout
 
+import cache
 import dedup
 
 SYSTEM_PROMPT = """\
@@ -21,85 +29,285 @@ Be concise and accurate. Always include CVE IDs when present.
 Respond with valid JSON only: {"articles": [{"title": "...", "summary": "...", "category": "..."}]}
 """
 
+# llm.skip_obvious でLLMを省略したグループの要約として残す文字数
+OBVIOUS_SUMMARY_CHARS = 300
+
+# Structured Outputs用の応答スキーマ（SYSTEM_PROMPTで指示している形式と同じ）
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "articles": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "summary": {"type": "string"},
+                    "category": {"type": "string", "enum": ["critical", "notable", "jp", "general"]},
+                },
+                "required": ["title", "summary", "category"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["articles"],
+    "additionalProperties": False,
+}
+
+# h2が導入されていればHTTP/2で接続し、並行リクエストを1本の接続に多重化する
+_HTTP2 = find_spec("h2") is not None
+_TIMEOUT = Timeout(60.0, connect=5.0)
+
+# 重大度を示す語句とCVSSスコアを1つの正規表現で走査する（スコアは group(1) に入る）
+_CRIT_RE = re.compile(
+    r"actively exploited|\bkev\b|critical vulnerability|zero-day|0-day|in the wild|cvss[:\s]*(\d+\.?\d*)",
+    re.IGNORECASE,
+)
+
+# llm.skip_obvious で重大案件と確信できる根拠（KEV掲載、CVSSスコアの明記）
+_CONFIDENT_CRIT_RE = re.compile(r"\bkev\b|known exploited vulnerabilit|cvss[:\s]*(\d+\.?\d*)", re.IGNORECASE)
+
 
-def _build_prompt(groups: list[list[dict[str, Any]]]) -> str:
+def _build_prompt(groups: list[list[dict[str, Any]]], group_cves: list[set[str]]) -> str:
     """記事グループからLLMへのユーザープロンプトを構築する。
 
     Parameters
     ----------
     groups : list[list[dict[str, Any]]]
         記事グループのリスト。
+    group_cves : list[set[str]]
+        ``groups`` と同じ順の、グループごとのCVE ID集合。
 
     Returns
     -------
     str
         構築されたプロンプト文字列。
     """
+    # 入力トークンを減らすため、空の項目は出力せず要約も先頭200文字に切り詰める
     parts = []
-    for i, group in enumerate(groups):
+    for i, (group, cves) in enumerate(zip(groups, group_cves, strict=True)):
         rep = group[0]
-        sources = ", ".join({a.get("source_name", "") for a in group if a.get("source_name")})
-        cve_text = ", ".join(
-            {cve for a in group for cve in dedup.extract_cves(a["title"] + " " + a.get("summary", ""))}
-        )
-        parts.append(
-            f"[Article {i + 1}]\n"
-            f"Title: {rep['title']}\n"
-            f"Sources ({len(group)}): {sources or 'unknown'}\n"
-            f"CVEs: {cve_text or 'none'}\n"
-            f"Language: {rep.get('lang', 'en')}\n"
-            f"Summary: {rep.get('summary', 'N/A')[:500]}\n"
-        )
+        lines = [f"#{i + 1}", f"Title: {rep['title']}"]
+        sources = ", ".join(dict.fromkeys(a["source_name"] for a in group if a.get("source_name")))
+        if sources:
+            lines.append(f"Sources ({len(group)}): {sources}")
+        elif len(group) > 1:
+            lines.append(f"Sources: {len(group)}")
+        if cves:
+            lines.append(f"CVEs: {', '.join(sorted(cves))}")
+        lang = rep.get("lang", "en")
+        if lang != "en":
+            lines.append(f"Language: {lang}")
+        summary = rep.get("summary", "")
+        if summary:
+            lines.append(f"Summary: {summary[:200]}")
+        parts.append("\n".join(lines))
     return "\n---\n".join(parts)
 
 
-def _call_llm(config: dict, groups: list[list[dict[str, Any]]]) -> dict | None:
-    """指定されたLLM設定でAPIを呼び出す。
+def _make_client(config: dict, clients: dict[tuple[str, str], AsyncOpenAI]) -> AsyncOpenAI | None:
+    """LLM設定に対応する非同期クライアントを返す。
+
+    同じエンドポイント・APIキーには ``clients`` に登録済みのクライアントを使い回し、
+    接続プールを共有する。``h2`` が導入されていればHTTP/2で接続する。
 
     Parameters
     ----------
     config : dict
-        LLM設定。``api_key_env``, ``api_base``, ``model`` などを含む。
-    groups : list[list[dict[str, Any]]]
-        記事グループのリスト。
+        LLM設定。``api_key_env``, ``api_base`` を含む。
+    clients : dict[tuple[str, str], AsyncOpenAI]
+        ``(api_base, api_key)`` をキーとする作成済みクライアント。新規作成分はここに追加する。
 
     Returns
     -------
-    dict or None
-        LLMのレスポンスをパースした辞書。失敗時は ``None``。
+    AsyncOpenAI or None
+        クライアント。APIキーが設定されていない場合は ``None``。
     """
     api_key = os.environ.get(config["api_key_env"], "")
     if not api_key:
         return None
+    key = (config["api_base"], api_key)
+    client = clients.get(key)
+    if client is None:
+        # タイムアウトはSDKが扱う型で渡すため、HTTPクライアントではなく AsyncOpenAI に指定する
+        http_client = DefaultAsyncHttpxClient(http2=_HTTP2)
+        client = clients[key] = AsyncOpenAI(
+            base_url=config["api_base"], api_key=api_key, timeout=_TIMEOUT, http_client=http_client
+        )
+    return client
 
-    client = OpenAI(base_url=config["api_base"], api_key=api_key)
-    user_prompt = _build_prompt(groups)
 
+async def _call_llm(client: AsyncOpenAI, config: dict, user_prompt: str) -> dict | None:
+    """指定されたLLM設定でAPIを呼び出す。
+
+    Parameters
+    ----------
+    client : AsyncOpenAI
+        ``_make_client`` で作成したクライアント。
+    config : dict
+        LLM設定。``model``, ``max_tokens``, ``temperature`` を含む。
+        ``stream: true`` の場合はストリーミングで受信する。
+    user_prompt : str
+        ``_build_prompt`` で構築したユーザープロンプト。
+
+    Returns
+    -------
+    dict or None
+        LLMのレスポンスをパースした辞書。失敗時は ``None``。
+    """
     try:
-        response = client.chat.completions.create(
-            model=config["model"],
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            max_tokens=config.get("max_tokens", 1024),
-            temperature=config.get("temperature", 0.3),
-        )
-        content = response.choices[0].message.content.strip()
-        if content.startswith("```"):
-            content = content.split("\n", 1)[1]
-            if content.endswith("```"):
-                content = content[:-3]
-        return json.loads(content)
+        body = _request_body(config, user_prompt)
+        if config.get("stream"):
+            # 生成中も受信を続けて読み取りタイムアウトを避け、断片をつなげてから解析する
+            chunks = []
+            async for chunk in await client.chat.completions.create(**body, stream=True):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+            content = "".join(chunks)
+        else:
+            response = await client.chat.completions.create(**body)
+            content = response.choices[0].message.content
+        return _parse_content(content)
     except Exception as e:
         print(f"[WARN] LLM call failed ({config['model']}): {e}")
         return None
 
 
+def _request_body(config: dict, user_prompt: str) -> dict[str, Any]:
+    """Chat Completions APIへ送るリクエストの本体を組み立てる。
+
+    エンドポイント設定で ``structured_output: true`` の場合は、JSON Schemaによる
+    Structured Outputsを指定して応答の形式をAPI側で保証させる。
+    """
+    body = {
+        "model": config["model"],
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        "max_tokens": config.get("max_tokens", 1024),
+        "temperature": config.get("temperature", 0.3),
+    }
+    if config.get("structured_output"):
+        body["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "articles", "schema": RESPONSE_SCHEMA, "strict": True},
+        }
+    return body
+
+
+def _parse_content(content: str) -> dict:
+    """LLMの応答テキストをJSONとして解析する。
+
+    Structured Outputsに対応していないエンドポイント向けに、コードフェンスは取り除いてから解析する。
+
+    Raises
+    ------
+    ValueError
+        JSONとして解析できない場合。
+    """
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.split("\n", 1)[1]
+        if content.endswith("```"):
+            content = content[:-3]
+    return json.loads(content)
+
+
+async def _summarize_all(
+    prompts: list[str], primary_cfg: dict, fallback_cfg: dict, concurrency: int, hedge_after: float | None = None
+) -> list[dict | None]:
+    """グループごとのプロンプトを同時実行数を制限しながら並行してLLMに送る。
+
+    グループ単位でプライマリを試し、失敗したグループだけフォールバックを使う。
+    ``hedge_after`` 秒たってもプライマリが応答しない場合は、フォールバックにも同時に送り
+    先に得られた結果を使う（もう一方は取り消す）。
+    同一のプロンプトは実行中のリクエストを共有し、LLMには1回だけ送る。
+
+    Parameters
+    ----------
+    prompts : list[str]
+        グループごとのユーザープロンプト。
+    primary_cfg : dict
+        プライマリLLM設定。
+    fallback_cfg : dict
+        フォールバックLLM設定。
+    concurrency : int
+        同時に送るリクエスト数の上限。
+    hedge_after : float or None
+        フォールバックへの先行送信を始めるまでの秒数。``None`` の場合はプライマリの失敗を待つ。
+
+    Returns
+    -------
+    list[dict or None]
+        ``prompts`` と同じ順の、LLMが返した記事の辞書。失敗したグループは ``None``。
+    """
+    clients: dict[tuple[str, str], AsyncOpenAI] = {}
+    primary = _make_client(primary_cfg, clients)
+    fallback = _make_client(fallback_cfg, clients)
+    if primary is None:
+        print("[INFO] Primary LLM unavailable, trying fallback...")
+    sem = asyncio.Semaphore(max(1, concurrency))
+    fallback_used = 0
+
+    async def ask(prompt: str) -> dict | None:
+        nonlocal fallback_used
+        if primary is None or fallback is None:
+            client, cfg = (primary, primary_cfg) if primary is not None else (fallback, fallback_cfg)
+            return await _call_llm(client, cfg, prompt) if client is not None else None
+
+        primary_task = asyncio.ensure_future(_call_llm(primary, primary_cfg, prompt))
+        await asyncio.wait({primary_task}, timeout=hedge_after)
+        if primary_task.done() and primary_task.result() is not None:
+            return primary_task.result()
+
+        fallback_task = asyncio.ensure_future(_call_llm(fallback, fallback_cfg, prompt))
+        pending = {primary_task, fallback_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.result() is not None:
+                    for other in pending:
+                        other.cancel()
+                    if task is fallback_task:
+                        fallback_used += 1
+                    return task.result()
+        return None
+
+    async def one(prompt: str) -> dict | None:
+        async with sem:
+            result = await ask(prompt)
+        articles = result.get("articles") if isinstance(result, dict) else None
+        return articles[0] if articles else None
+
+    # 同じプロンプトが複数グループにある場合は1回だけ送り、結果を共有する
+    inflight: dict[str, asyncio.Future] = {}
+
+    def shared(prompt: str) -> asyncio.Future:
+        fut = inflight.get(prompt)
+        if fut is None:
+            fut = inflight[prompt] = asyncio.ensure_future(one(prompt))
+        return fut
+
+    try:
+        outputs = await asyncio.gather(*(shared(p) for p in prompts))
+    finally:
+        for client in clients.values():
+            await client.close()
+
+    if primary is not None and fallback_used:
+        print(f"[INFO] Fallback LLM used for {fallback_used} group(s)")
+    return outputs
+
+
 def summarize(groups: list[list[dict[str, Any]]], llm_config: dict) -> list[dict[str, Any]]:
     """記事グループをLLMで要約・カテゴリ分類する。
 
-    プライマリLLMに接続できない場合、フォールバックLLMに自動切り替えする。
+    グループごとにリクエストを分け、``llm.concurrency`` （デフォルト8）件まで並行して送る。
+    同じプロンプトの結果は ``llm.cache_ttl_days`` 日の間ローカルにキャッシュし、LLMを呼ばずに再利用する。
+    プロンプトが一致しなくても、タイトルが ``llm.semantic_threshold`` 以上類似しCVEが共通する
+    キャッシュ済みグループがあれば、その結果を再利用する。
+    プライマリLLMに接続できないグループはフォールバックLLMに自動切り替えする。
     どちらも利用不可の場合はヒューリスティック分類を使用する。
 
     Parameters
@@ -115,55 +323,356 @@ def summarize(groups: list[list[dict[str, Any]]], llm_config: dict) -> list[dict
         要約済み記事の辞書リスト。各辞書は ``title``, ``summary``,
         ``category``, ``sources``, ``urls``, ``cves`` を持つ。
     """
-    primary_cfg = {
-        **llm_config["primary"],
+    return _summarize(groups, llm_config, use_batch=False)
+
+
+def summarize_batch(groups: list[list[dict[str, Any]]], llm_config: dict) -> list[dict[str, Any]]:
+    """``summarize`` と同じ処理を、キャッシュに無いグループはBatch APIでまとめて要約する。
+
+    Batch APIは料金が通常の半額になる代わりに完了まで時間がかかる（最大24時間）ため、
+    定期実行など待ち時間を許容できる場合に使う。プライマリ、フォールバックの順に投入を試し、
+    どちらも使えない場合や結果が得られなかったグループは通常のリクエストで要約する。
+
+    Parameters
+    ----------
+    groups : list[list[dict[str, Any]]]
+        記事グループのリスト。
+    llm_config : dict
+        LLM設定。``primary`` と ``fallback`` の設定を含む。
+        ``batch_poll_seconds`` （デフォルト60）で完了確認の間隔を指定できる。
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        要約済み記事の辞書リスト。``summarize`` と同じ形式。
+    """
+    return _summarize(groups, llm_config, use_batch=True)
+
+
+def _summarize(groups: list[list[dict[str, Any]]], llm_config: dict, use_batch: bool) -> list[dict[str, Any]]:
+    """``summarize`` / ``summarize_batch`` の共通処理。
+
+    キャッシュで全グループの結果が揃った場合は、エンドポイント設定の組み立てもクライアントの作成も行わない。
+    ``llm.skip_obvious`` が真の場合、CVEを含み、日本語ソースかKEV掲載・CVSS 9.0以上が明記されたグループは
+    LLMに送らず、元の要約を ``OBVIOUS_SUMMARY_CHARS`` 文字に切り詰めて使う。
+    """
+    # CVE抽出はプロンプト構築と結果の組み立ての両方で使うため、グループごとに1回だけ行う
+    group_cves = [_group_cves(group) for group in groups]
+    results = [heuristic_entry(group, cves) for group, cves in zip(groups, group_cves, strict=True)]
+
+    # 分類が明らかなグループ（CVE付きの日本語ソース・KEV掲載・CVSS 9.0以上）はLLMに送らずヒューリスティックの結果を使う
+    todo = list(range(len(groups)))
+    if llm_config.get("skip_obvious"):
+        todo = [i for i in todo if not _is_obvious(results[i])]
+        for i in set(range(len(groups))).difference(todo):
+            results[i]["summary"] = results[i]["summary"][:OBVIOUS_SUMMARY_CHARS]
+        if len(todo) < len(groups):
+            print(f"    Skipped LLM for {len(groups) - len(todo)} obvious group(s)")
+    if not todo:
+        return results
+    pending = [results[i] for i in todo]
+    groups = [groups[i] for i in todo]
+    group_cves = [group_cves[i] for i in todo]
+
+    prompts = [_build_prompt([group], [cves]) for group, cves in zip(groups, group_cves, strict=True)]
+    keys = [_cache_key(prompt, llm_config) for prompt in prompts]
+
+    with _open_llm_cache(llm_config) as store:
+        llm_outputs: list[dict | None] = [None] * len(groups)
+        titles: list[str] = []
+        if store:
+            titles = [dedup.normalize_title(group[0]["title"]) for group in groups]
+            llm_outputs = [_cached_result(store.get(key)) for key in keys]
+            exact_hits = sum(out is not None for out in llm_outputs)
+            threshold = llm_config.get("semantic_threshold", 0.9)
+            if threshold and exact_hits < len(groups):
+                # 未解決グループのCVEが付いたキャッシュ項目だけを索引から取り出す
+                miss_cves = {
+                    cve for out, cves in zip(llm_outputs, group_cves, strict=True) if out is None for cve in cves
+                }
+                _fill_similar(llm_outputs, titles, group_cves, store.values_with_tags(miss_cves), threshold)
+            similar_hits = sum(out is not None for out in llm_outputs) - exact_hits
+            print(f"    LLM cache hits: {exact_hits} exact, {similar_hits} similar / {len(groups)}")
+
+        misses = [i for i, out in enumerate(llm_outputs) if out is None]
+        if misses:
+            primary_cfg = _endpoint_config(llm_config, "primary")
+            fallback_cfg = _endpoint_config(llm_config, "fallback")
+            miss_prompts = [prompts[i] for i in misses]
+            fresh = _run_batch(miss_prompts, primary_cfg, fallback_cfg, llm_config) if use_batch else None
+            fresh = _fill_with_requests(fresh, miss_prompts, primary_cfg, fallback_cfg, llm_config)
+            for i, out in zip(misses, fresh, strict=True):
+                llm_outputs[i] = out
+                if out and store:
+                    cves = sorted(group_cves[i])
+                    store.set(keys[i], {"title": titles[i], "cves": cves, "result": out}, tags=cves)
+
+    for entry, llm_art in zip(pending, llm_outputs, strict=True):
+        if llm_art:
+            entry["title"] = llm_art.get("title", entry["title"])
+            entry["summary"] = llm_art.get("summary", entry["summary"])
+            entry["category"] = llm_art.get("category", entry["category"])
+
+    return results
+
+
+def _is_obvious(entry: dict[str, Any]) -> bool:
+    """LLMに送らなくても分類が確実なダイジェスト項目かを判定する。
+
+    CVEを含み、日本語ソースであるか、KEV掲載またはCVSS 9.0以上がタイトル・要約に明記されている場合に限る。
+    「in the wild」などの語句だけで ``critical`` と推定した項目はLLMに送る。
+    """
+    if not entry["cves"]:
+        return False
+    if entry["category"] == "jp":
+        return True
+    for text in (entry["title"], entry["summary"]):
+        for m in _CONFIDENT_CRIT_RE.finditer(text):
+            score = m.group(1)
+            if score is None or float(score) >= 9.0:
+                return True
+    return False
+
+
+def _endpoint_config(llm_config: dict, name: str) -> dict:
+    """``primary`` / ``fallback`` のエンドポイント設定に共通の生成パラメータを加える。"""
+    return {
+        **llm_config[name],
         "max_tokens": llm_config.get("max_tokens", 1024),
         "temperature": llm_config.get("temperature", 0.3),
     }
-    fallback_cfg = {
-        **llm_config["fallback"],
-        "max_tokens": llm_config.get("max_tokens", 1024),
-        "temperature": llm_config.get("temperature", 0.3),
+
+
+def _fill_with_requests(
+    outputs: list[dict | None] | None, prompts: list[str], primary_cfg: dict, fallback_cfg: dict, llm_config: dict
+) -> list[dict | None]:
+    """結果の無いプロンプトを通常のリクエストで並行して要約し、``outputs`` を埋めて返す。"""
+    if outputs is None:
+        outputs = [None] * len(prompts)
+    todo = [i for i, out in enumerate(outputs) if out is None]
+    if todo:
+        concurrency = llm_config.get("concurrency", 8)
+        hedge_after = llm_config.get("hedge_after_seconds")
+        fresh = asyncio.run(
+            _summarize_all([prompts[i] for i in todo], primary_cfg, fallback_cfg, concurrency, hedge_after)
+        )
+        for i, out in zip(todo, fresh, strict=True):
+            outputs[i] = out
+    return outputs
+
+
+def _run_batch(prompts: list[str], primary_cfg: dict, fallback_cfg: dict, llm_config: dict) -> list[dict | None] | None:
+    """プロンプトをBatch APIに投入し、完了を待って結果を返す。
+
+    Parameters
+    ----------
+    prompts : list[str]
+        グループごとのユーザープロンプト。
+    primary_cfg : dict
+        プライマリLLM設定。
+    fallback_cfg : dict
+        フォールバックLLM設定。
+    llm_config : dict
+        LLM設定全体（``batch_poll_seconds`` を参照する）。
+
+    Returns
+    -------
+    list[dict or None] or None
+        ``prompts`` と同じ順の、LLMが返した記事の辞書（失敗したものは ``None``）。
+        どちらのエンドポイントでもバッチを実行できなかった場合は ``None``。
+    """
+    poll_seconds = llm_config.get("batch_poll_seconds", 60)
+    for config in (primary_cfg, fallback_cfg):
+        api_key = os.environ.get(config["api_key_env"], "")
+        if not api_key:
+            continue
+        client = OpenAI(base_url=config["api_base"], api_key=api_key)
+        try:
+            return _run_batch_on(client, config, prompts, poll_seconds)
+        except Exception as e:
+            print(f"[WARN] Batch API failed ({config['model']}): {e}")
+        finally:
+            client.close()
+    return None
+
+
+def _run_batch_on(client: OpenAI, config: dict, prompts: list[str], poll_seconds: float) -> list[dict | None]:
+    """1つのエンドポイントでバッチを作成し、完了まで待って結果を取り出す。"""
+    lines = [
+        json.dumps(
+            {
+                "custom_id": f"g{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _request_body(config, prompt),
+            },
+            ensure_ascii=False,
+        )
+        for i, prompt in enumerate(prompts)
+    ]
+    batch_file = client.files.create(file=("digest_batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = client.batches.create(input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+    print(f"[*] Submitted batch {batch.id} ({len(prompts)} requests), waiting for completion...")
+    while batch.status in ("validating", "in_progress", "finalizing"):
+        time.sleep(poll_seconds)
+        batch = client.batches.retrieve(batch.id)
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"batch {batch.id} ended with status {batch.status}")
+
+    outputs: list[dict | None] = [None] * len(prompts)
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            body = record["response"]["body"]
+            articles = _parse_content(body["choices"][0]["message"]["content"]).get("articles")
+            outputs[int(record["custom_id"][1:])] = articles[0] if articles else None
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+            print(f"[WARN] Skipping unreadable batch result: {e}")
+    return outputs
+
+
+def _cache_key(user_prompt: str, llm_config: dict) -> str:
+    """プロンプトとモデル・生成パラメータからLLM結果のキャッシュキーを作る。
+
+    結果はプライマリ・フォールバックのどちらから得たものも同じキーで保存するため、
+    両方の ``model`` / ``structured_output`` と、共通の ``max_tokens`` / ``temperature`` を含める。
+    どれかを変更すると以前の結果は使われなくなる。
+    """
+    endpoints = {
+        name: [llm_config.get(name, {}).get("model"), bool(llm_config.get(name, {}).get("structured_output"))]
+        for name in ("primary", "fallback")
     }
+    params = [llm_config.get("max_tokens", 1024), llm_config.get("temperature", 0.3)]
+    payload = json.dumps([SYSTEM_PROMPT, user_prompt, endpoints, params], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
 
-    llm_result = _call_llm(primary_cfg, groups)
-    if llm_result is None:
-        print("[INFO] Primary LLM unavailable, trying fallback...")
-        llm_result = _call_llm(fallback_cfg, groups)
 
-    results = []
-    for i, group in enumerate(groups):
-        rep = group[0]
-        all_cves: set = set()
-        all_sources: set = set()
-        all_urls: list = []
-        for a in group:
-            all_cves |= dedup.extract_cves(a["title"] + " " + a.get("summary", ""))
-            if a.get("source_name"):
-                all_sources.add(a["source_name"])
-            if a["url"]:
-                all_urls.append(a["url"])
-
-        entry = {
-            "title": rep["title"],
-            "summary": rep.get("summary", ""),
-            "category": _guess_category(group, rep),
-            "sources": list(all_sources),
-            "urls": list(set(all_urls)),
-            "cves": list(all_cves),
-            "source_count": len(group),
-            "lang": rep.get("lang", "en"),
-        }
+def _cached_result(value: Any) -> dict | None:
+    """キャッシュの値からLLMの結果部分を取り出す。"""
+    if isinstance(value, dict) and isinstance(value.get("result"), dict):
+        return value["result"]
+    return None
 
-        if llm_result and "articles" in llm_result and i < len(llm_result["articles"]):
-            llm_art = llm_result["articles"][i]
-            entry["title"] = llm_art.get("title", entry["title"])
-            entry["summary"] = llm_art.get("summary", entry["summary"])
-            entry["category"] = llm_art.get("category", entry["category"])
 
-        results.append(entry)
+def _fill_similar(
+    outputs: list[dict | None], titles: list[str], group_cves: list[set[str]], cached: list[Any], threshold: float
+) -> None:
+    """未解決のグループに、言い換えに近いキャッシュ済みグループの結果を割り当てる。
 
-    return results
+    正規化タイトルの類似度が ``threshold`` 以上で、CVE IDが共通するキャッシュ項目を同じ話題とみなす。
+    CVEを持たないグループは定期的な連載記事（月例パッチ、週次まとめ等）で前回の要約を取り違えやすいため、
+    類似判定の対象にしない。``outputs`` をその場で更新する。
+
+    Parameters
+    ----------
+    outputs : list[dict or None]
+        グループごとのLLM結果。``None`` の要素だけを埋める。
+    titles : list[str]
+        グループ代表記事の正規化タイトル。
+    group_cves : list[set[str]]
+        グループごとのCVE ID集合。
+    cached : list[Any]
+        ``SQLiteCache.values_with_tags`` で取得した、未解決グループとCVEが共通するキャッシュの値。
+    threshold : float
+        タイトル類似度の閾値。
+    """
+    # 取得済みの候補をCVEごとに分け、各グループとCVEが共通する項目だけを比較する。
+    # 類似度 2M/(la+lb) は 2*min(la,lb)/(la+lb) を超えないため、閾値に届かない長さの項目は比較しない。
+    entries: list[tuple[str, dict]] = []
+    by_cve: dict[str, list[int]] = {}
+    for v in cached:
+        result = _cached_result(v)
+        if result is None or not v.get("title") or not v.get("cves"):
+            continue
+        for cve in v["cves"]:
+            by_cve.setdefault(cve, []).append(len(entries))
+        entries.append((v["title"], result))
+
+    for i, out in enumerate(outputs):
+        title = titles[i]
+        cves = group_cves[i]
+        if out is not None or not title or not cves:
+            continue
+        n = len(title)
+        lo, hi = n * threshold / (2 - threshold), n * (2 - threshold) / threshold
+        matcher = dedup.TitleMatcher(title, threshold)
+        for j in sorted({j for cve in cves for j in by_cve.get(cve, ())}):
+            cand_title, result = entries[j]
+            if lo <= len(cand_title) <= hi and matcher.similar(cand_title):
+                outputs[i] = result
+                break
+
+
+@contextmanager
+def _open_llm_cache(llm_config: dict) -> Iterator[cache.SQLiteCache | None]:
+    """LLM結果のキャッシュを開く。
+
+    ``llm.cache_ttl_days`` （デフォルト7）が0以下の場合や、開けない場合は ``None`` を返す。
+    """
+    ttl_days = llm_config.get("cache_ttl_days", 7)
+    if not ttl_days or ttl_days <= 0:
+        yield None
+        return
+    try:
+        store = cache.SQLiteCache(cache.cache_dir() / "llm.sqlite3", ttl_days * 86400)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARN] LLM cache unavailable: {e}")
+        yield None
+        return
+    with store:
+        yield store
+
+
+def heuristic_entry(group: list[dict[str, Any]], cves: set[str] | None = None) -> dict[str, Any]:
+    """記事グループからLLMを使わずにダイジェスト項目を組み立てる。
+
+    LLMの結果で上書きする前の初期値としても使う。
+
+    Parameters
+    ----------
+    group : list[dict[str, Any]]
+        同一トピックの記事グループ。先頭を代表記事とする。
+    cves : set[str] or None
+        抽出済みのCVE ID集合。``None`` の場合はグループから抽出する。
+
+    Returns
+    -------
+    dict[str, Any]
+        ``title``, ``summary``, ``category``, ``sources``, ``urls``, ``cves``,
+        ``source_count``, ``lang`` を持つ辞書。
+    """
+    rep = group[0]
+    return {
+        "title": rep["title"],
+        "summary": rep.get("summary", ""),
+        "category": _guess_category(group, rep),
+        "sources": list(dict.fromkeys(a["source_name"] for a in group if a.get("source_name"))),
+        "urls": list(dict.fromkeys(a["url"] for a in group if a["url"])),
+        "cves": sorted(_group_cves(group) if cves is None else cves),
+        "source_count": len(group),
+        "lang": rep.get("lang", "en"),
+    }
+
+
+def _group_cves(group: list[dict[str, Any]]) -> set[str]:
+    """グループ内の全記事のタイトル・要約からCVE IDを抽出する。
+
+    記事ごとに正規表現を呼ばず、全記事を改行で連結したテキストを1回だけ走査する。
+
+    Parameters
+    ----------
+    group : list[dict[str, Any]]
+        記事グループ。
+
+    Returns
+    -------
+    set[str]
+        大文字に正規化したCVE IDの集合。
+    """
+    blob = "\n".join(a["title"] + " " + a.get("summary", "") for a in group)
+    return {m.upper() for m in dedup.CVE_PATTERN.findall(blob)}
 
 
 def _guess_category(group: list[dict[str, Any]], rep: dict[str, Any]) -> str:
@@ -181,27 +690,15 @@ def _guess_category(group: list[dict[str, Any]], rep: dict[str, Any]) -> str:
     str
         カテゴリ文字列（``critical``, ``notable``, ``jp``, ``general``）。
     """
-    text = (rep["title"] + " " + rep.get("summary", "")).lower()
-
     if rep.get("lang") == "ja":
         return "jp"
 
-    critical_terms = [
-        "actively exploited",
-        "kev",
-        "cvss 9",
-        "cvss 10",
-        "critical vulnerability",
-        "zero-day",
-        "0-day",
-        "in the wild",
-    ]
-    if any(term in text for term in critical_terms):
-        return "critical"
-
-    cvss_match = re.search(r"cvss[:\s]*(\d+\.?\d*)", text)
-    if cvss_match and float(cvss_match.group(1)) >= 9.0:
-        return "critical"
+    # 連結・小文字化したコピーは作らず、タイトルと要約をそれぞれ大文字小文字を無視して走査する
+    for text in (rep["title"], rep.get("summary", "")):
+        for m in _CRIT_RE.finditer(text):
+            score = m.group(1)
+            if score is None or float(score) >= 9.0:
+                return "critical"
 
     if len(group) >= 3:
         return "notable"
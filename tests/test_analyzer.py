@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
 
 import pytest
 
-from analyzer import classify_gap_cause, find_gaps, parse_command
+import analyzer
+from analyzer import classify_gap_cause, classify_gaps, find_gaps, parse_command, parse_digest_markdown
 
 
 def test_find_gaps_url_match_and_title_similarity():
@@ -46,6 +48,22 @@ def test_classify_gap_cause_dedup_merged_by_cve_overlap():
     assert out["cause"] == "dedup_merged"
 
 
+def test_classify_gaps_uses_first_group_sharing_cve():
+    gaps = [
+        {"title": "CVE-2024-1234 exploited", "url": "https://example.com/x"},
+        {"title": "Unrelated", "url": "https://missed.example.net/post"},
+    ]
+    feeds = [{"name": "Example", "url": "https://example.com/rss", "lang": "en"}]
+    groups = [
+        [{"title": "No CVE here", "summary": "", "url": "https://example.com/a"}],
+        [{"title": "First", "summary": "CVE-2024-1234", "url": "https://example.com/b"}],
+        [{"title": "Second", "summary": "CVE-2024-1234", "url": "https://example.com/c"}],
+    ]
+    out = classify_gaps(gaps, feeds, [], groups, {"window_days": 3})
+    assert [o["cause"] for o in out] == ["dedup_merged", "feed_missing"]
+    assert "First" in out[0]["detail"]
+
+
 def test_classify_gap_cause_interest_filtered():
     gap = {"title": "Linux kernel update", "url": "https://example.com/k"}
     feeds = [{"name": "Example", "url": "https://example.com/rss", "lang": "en"}]
@@ -61,6 +79,21 @@ def test_classify_gap_cause_low_rank_when_fetched():
     assert out["cause"] == "low_rank"
 
 
+def test_parse_digest_markdown_pairs_titles_with_urls(tmp_path):
+    md = tmp_path / "digest.md"
+    md.write_text(
+        "# Security News Digest\n\n## General\n\n### First\n\nsummary\n"
+        "- <https://a.example.com/1>\n- <https://a.example.com/2>\n\n---\n\n"
+        "### Second\n\n- <https://b.example.com/1>\n",
+        encoding="utf-8",
+    )
+    assert parse_digest_markdown(str(md)) == [
+        {"title": "First", "url": "https://a.example.com/1"},
+        {"title": "First", "url": "https://a.example.com/2"},
+        {"title": "Second", "url": "https://b.example.com/1"},
+    ]
+
+
 @pytest.mark.parametrize(
     "line,expected",
     [
@@ -73,3 +106,38 @@ def test_classify_gap_cause_low_rank_when_fetched():
 def test_parse_command(line: str, expected: tuple[str, list[str]]):
     cmd = parse_command(line)
     assert (cmd.name, cmd.args) == expected
+
+
+def test_fetch_reference_extracts_unique_absolute_links(monkeypatch):
+    html = """<html><body>
+    <a href="https://e.com/a"><img src="logo.png"></a>
+    <a href="https://e.com/a">脆弱性\n   速報</a>
+    <a href="https://e.com/b">First  title</a>
+    <a href="https://e.com/b">Second title</a>
+    <a href="/relative">Relative link</a>
+    </body></html>"""
+    resp = SimpleNamespace(
+        content=html.encode("utf-8"),
+        headers={"Content-Type": "text/html; charset=x-unknown-charset"},
+        encoding="x-unknown-charset",
+        raise_for_status=lambda: None,
+    )
+    monkeypatch.setattr(analyzer._SESSION, "get", lambda url, timeout: resp)
+
+    assert analyzer.fetch_reference("https://ref.example.com") == [
+        {"title": "脆弱性 速報", "url": "https://e.com/a"},
+        {"title": "First title", "url": "https://e.com/b"},
+    ]
+
+
+def test_fetch_reference_uses_meta_charset_without_header_charset(monkeypatch):
+    html = '<html><head><meta charset="shift_jis"></head><body><a href="https://e.com/a">脆弱性情報</a></body></html>'
+    resp = SimpleNamespace(
+        content=html.encode("shift_jis"),
+        headers={"Content-Type": "text/html"},
+        encoding="ISO-8859-1",
+        raise_for_status=lambda: None,
+    )
+    monkeypatch.setattr(analyzer._SESSION, "get", lambda url, timeout: resp)
+
+    assert analyzer.fetch_reference("https://ref.example.com") == [{"title": "脆弱性情報", "url": "https://e.com/a"}]
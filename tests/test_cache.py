@@ -0,0 +1,65 @@
+import sqlite3
+
+import cache
+
+
+def test_cache_dir_uses_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("SECURITY_NEWS_DIGEST_CACHE_DIR", str(tmp_path))
+    path = cache.cache_dir("feeds")
+    assert path == tmp_path / "feeds"
+    assert path.is_dir()
+
+
+def test_save_and_load_json_roundtrip(tmp_path):
+    path = tmp_path / "entry.json"
+    cache.save_json(path, {"title": "脆弱性", "n": 1})
+    assert cache.load_json(path) == {"title": "脆弱性", "n": 1}
+
+
+def test_load_json_missing_or_broken(tmp_path):
+    assert cache.load_json(tmp_path / "missing.json") is None
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+    assert cache.load_json(broken) is None
+
+
+def test_cache_key_is_stable():
+    assert cache.cache_key("https://example.com") == cache.cache_key("https://example.com")
+    assert cache.cache_key("a") != cache.cache_key("b")
+
+
+def test_sqlite_cache_roundtrip_and_ttl(tmp_path):
+    with cache.SQLiteCache(tmp_path / "kv.sqlite3", ttl_seconds=60) as store:
+        store.set("k", {"title": "要約"})
+        assert store.get("k") == {"title": "要約"}
+        assert store.get("missing") is None
+    with cache.SQLiteCache(tmp_path / "kv.sqlite3", ttl_seconds=-1) as store:
+        assert store.get("k") is None
+
+
+def test_sqlite_cache_deletes_expired_rows_on_open(tmp_path):
+    path = tmp_path / "kv.sqlite3"
+    with cache.SQLiteCache(path, ttl_seconds=60) as store:
+        for i in range(100):
+            store.set(f"k{i}", i)
+    cache.SQLiteCache(path, ttl_seconds=-1).close()
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM cache").fetchone() == (0,)
+    conn.close()
+
+
+def test_sqlite_cache_values_with_tags(tmp_path):
+    path = tmp_path / "kv.sqlite3"
+    with cache.SQLiteCache(path, ttl_seconds=60) as store:
+        store.set("a", "A", tags=["CVE-1", "CVE-2"])
+        store.set("b", "B", tags=["CVE-3"])
+        store.set("c", "C")
+        assert sorted(store.values_with_tags(["CVE-1", "CVE-2", "CVE-9"])) == ["A"]
+        store.set("b", "B2", tags=["CVE-1"])
+        assert sorted(store.values_with_tags(["CVE-1"])) == ["A", "B2"]
+        assert store.values_with_tags(["CVE-3"]) == []
+        assert store.values_with_tags([]) == []
+    cache.SQLiteCache(path, ttl_seconds=-1).close()
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM cache_tag").fetchone() == (0,)
+    conn.close()
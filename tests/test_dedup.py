@@ -1,4 +1,4 @@
-from dedup import deduplicate, extract_cves, normalize_title, titles_similar
+from dedup import deduplicate, extract_cves, match_any, normalize_title, titles_similar
 
 
 def test_extract_cves_found():
@@ -55,3 +55,23 @@ def test_deduplicate_by_title_similarity():
     ]
     groups = deduplicate(articles)
     assert len(groups) == 1
+
+
+def test_deduplicate_merges_transitively():
+    articles = [
+        {"title": "Patch for CVE-2024-9999", "url": "https://c.com", "summary": ""},
+        {"title": "Vendor advisory", "url": "https://shared.com/post", "summary": ""},
+        {"title": "Exploit released", "url": "https://shared.com/post", "summary": "CVE-2024-9999"},
+        {"title": "Unrelated story", "url": "https://d.com", "summary": ""},
+    ]
+    groups = deduplicate(articles)
+    assert [[a["url"] for a in g] for g in groups] == [
+        ["https://c.com", "https://shared.com/post", "https://shared.com/post"],
+        ["https://d.com"],
+    ]
+
+
+def test_match_any():
+    choices = ["critical vulnerability in the linux kernel", "", "apple releases ios update"]
+    queries = ["critical vulnerability in linux kernel", "google patches android flaw", ""]
+    assert match_any(queries, choices) == [True, False, False]
@@ -1,6 +1,9 @@
+import time
+from datetime import UTC, datetime
 from types import SimpleNamespace
 
-from fetcher import _extract_source, _parse_date
+import fetcher
+from fetcher import _extract_source, _parse_date, fetch_feeds
 
 
 def test_parse_date_published():
@@ -11,6 +14,25 @@ def test_parse_date_published():
     assert result.tzinfo is not None
 
 
+def test_parse_date_rfc2822_offset():
+    entry = {"published": "Mon, 10 Feb 2025 21:00:00 +0900"}
+    result = _parse_date(entry)
+    assert result == datetime(2025, 2, 10, 12, 0, tzinfo=UTC)
+
+
+def test_parse_date_iso8601():
+    entry = {"updated": "2025-02-10T12:00:00Z"}
+    assert _parse_date(entry) == datetime(2025, 2, 10, 12, 0, tzinfo=UTC)
+
+
+def test_parse_date_prefers_feedparser_struct_time():
+    entry = {
+        "published": "ignored because already parsed",
+        "published_parsed": time.struct_time((2025, 2, 10, 12, 0, 0, 0, 41, 0)),
+    }
+    assert _parse_date(entry) == datetime(2025, 2, 10, 12, 0, tzinfo=UTC)
+
+
 def test_parse_date_none():
     entry = {}
     assert _parse_date(entry) is None
@@ -40,3 +62,94 @@ def test_extract_source_empty():
     entry.get = lambda k, d="": getattr(entry, k, d)
     result = _extract_source(entry)
     assert result == ""
+
+
+def test_fetch_feeds_keeps_feed_order_and_skips_failures(monkeypatch):
+    def fake_download(url, cutoff):
+        if "bad" in url:
+            raise OSError("boom")
+        return [{"title": f"Post from {url}", "url": f"{url}/1", "summary": "", "published": None, "source_name": ""}]
+
+    monkeypatch.setattr(fetcher, "_download_feed", fake_download)
+    feeds = [
+        {"name": "A", "url": "https://a.example.com/rss"},
+        {"name": "Bad", "url": "https://bad.example.com/rss"},
+        {"name": "B", "url": "https://b.example.com/rss", "lang": "ja"},
+    ]
+    articles = fetch_feeds(feeds)
+    assert [a["source_feed"] for a in articles] == ["A", "B"]
+    assert articles[1]["lang"] == "ja"
+
+
+class _FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None, url=""):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise OSError(self.status_code)
+
+
+def test_download_feed_reuses_cache_on_304(monkeypatch, tmp_path):
+    monkeypatch.setenv("SECURITY_NEWS_DIGEST_CACHE_DIR", str(tmp_path))
+    url = "https://example.com/rss"
+    sent_headers = []
+    responses = [
+        _FakeResponse(200, b"<rss/>", {"ETag": '"v1"'}, url),
+        _FakeResponse(304, url=url),
+    ]
+
+    def fake_get(u, timeout, headers):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    entry = {"title": "Post", "link": f"{url}/1", "summary": "s", "published": "2025-02-10T12:00:00Z"}
+    monkeypatch.setattr(fetcher._SESSION, "get", fake_get)
+    monkeypatch.setattr(fetcher.feedparser, "parse", lambda *a, **k: SimpleNamespace(entries=[entry]))
+
+    cutoff = datetime(2025, 2, 1, tzinfo=UTC)
+    first = fetcher._download_feed(url, cutoff)
+    second = fetcher._download_feed(url, cutoff)
+
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+    assert second == first
+    assert second[0]["published"] == datetime(2025, 2, 10, 12, 0, tzinfo=UTC)
+
+
+def test_download_feed_refetches_when_window_widens(monkeypatch, tmp_path):
+    monkeypatch.setenv("SECURITY_NEWS_DIGEST_CACHE_DIR", str(tmp_path))
+    url = "https://example.com/rss"
+    sent_headers = []
+
+    def fake_get(u, timeout, headers):
+        sent_headers.append(headers)
+        return _FakeResponse(200, b"<rss/>", {"ETag": '"v1"'}, url)
+
+    monkeypatch.setattr(fetcher._SESSION, "get", fake_get)
+    monkeypatch.setattr(fetcher.feedparser, "parse", lambda *a, **k: SimpleNamespace(entries=[]))
+
+    fetcher._download_feed(url, datetime(2025, 2, 10, tzinfo=UTC))
+    fetcher._download_feed(url, datetime(2025, 2, 1, tzinfo=UTC))
+    assert sent_headers == [{}, {}]
+
+
+def test_is_stale_uses_parsed_time_only():
+    cutoff_ts = datetime(2025, 2, 10, tzinfo=UTC).timestamp()
+    old = time.struct_time((2025, 2, 1, 0, 0, 0, 0, 32, 0))
+    assert fetcher._is_stale({"published_parsed": old}, cutoff_ts)
+    assert not fetcher._is_stale({"published": "Sat, 01 Feb 2025 00:00:00 GMT"}, cutoff_ts)
+    assert not fetcher._is_stale({}, cutoff_ts)
+
+
+def test_host_slot_is_shared_per_host():
+    a = fetcher._host_slot("https://example.com/rss")
+    assert fetcher._host_slot("https://EXAMPLE.com/atom") is a
+    assert fetcher._host_slot("https://other.example.com/rss") is not a
+
+
+def test_extract_source_prefers_last_dash_segment():
+    entry = {"title": "Vendor | Product - Flaw fixed - Security-Week "}
+    assert _extract_source(entry) == "Security-Week"
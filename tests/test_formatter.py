@@ -1,4 +1,4 @@
-from formatter import format_digest
+from formatter import format_digest, iter_digest
 
 
 def test_format_digest_header():
@@ -51,3 +51,21 @@ def test_format_digest_skips_empty_categories():
     result = format_digest(articles, "2025-02-10")
     assert "🇯🇵 Japan" in result
     assert "🔴 Critical" not in result
+
+
+def test_iter_digest_joins_to_format_digest():
+    articles = [
+        {"title": "A", "summary": "s", "category": "notable", "sources": ["X"], "urls": ["https://e.com/a"]},
+        {"title": "B", "summary": "t", "category": "critical", "cves": ["CVE-2025-0001"]},
+    ]
+    assert "\n".join(iter_digest(articles, "2025-02-10")) == format_digest(articles, "2025-02-10")
+
+
+def test_format_digest_caps_each_category():
+    articles = [{"title": f"G{i}", "summary": "", "category": "general", "source_count": i} for i in range(5)]
+    articles.append({"title": "C0", "summary": "", "category": "critical"})
+    result = format_digest(articles, "2025-02-10", max_per_category=2)
+    assert "Articles: 3" in result
+    assert "### G4" in result and "### G3" in result
+    assert "### G2" not in result
+    assert "### C0" in result
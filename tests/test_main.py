@@ -1,7 +1,7 @@
 import os
 import tempfile
 
-from main import load_config, load_feeds_file
+from main import _write_digest, filter_by_interests, load_config, load_feeds_file
 
 
 def test_load_feeds_file():
@@ -31,3 +31,31 @@ def test_load_config():
         assert config["feeds"][0]["name"] == "Test"
     finally:
         os.unlink(f.name)
+
+
+def test_filter_by_interests_matches_case_insensitively():
+    groups = [
+        [{"title": "New RANSOMWARE strain", "summary": ""}],
+        [{"title": "Patch Tuesday", "summary": "Fixes for c++ runtime"}],
+        [{"title": "Unrelated", "summary": "nothing here"}],
+    ]
+    result = filter_by_interests(groups, ["ransomware", "C++"])
+    assert result == groups[:2]
+    assert filter_by_interests(groups, []) == []
+
+
+def test_write_digest_skips_unchanged_output(tmp_path):
+    results = [{"title": "A", "summary": "s", "category": "general", "urls": ["https://e.com/a"]}]
+    out_path = _write_digest(results, {}, str(tmp_path))
+    with open(out_path, "a") as f:
+        f.write("marker\n")
+
+    assert _write_digest(results, {}, str(tmp_path)) == out_path
+    with open(out_path) as f:
+        assert f.read().endswith("marker\n")
+
+    _write_digest([{**results[0], "summary": "changed"}], {}, str(tmp_path))
+    with open(out_path) as f:
+        content = f.read()
+    assert "changed" in content
+    assert "marker" not in content
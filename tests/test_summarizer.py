@@ -0,0 +1,339 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import summarizer
+from summarizer import _guess_category, heuristic_entry
+
+
+def test_heuristic_entry_keeps_first_seen_url_order():
+    group = [
+        {"title": "Vuln A", "url": "https://b.example.com/1", "source_name": "B"},
+        {"title": "Vuln A", "url": "https://a.example.com/1", "source_name": "A"},
+        {"title": "Vuln A", "url": "https://b.example.com/1", "source_name": "B"},
+        {"title": "Vuln A", "url": "", "source_name": ""},
+    ]
+    entry = heuristic_entry(group)
+    assert entry["urls"] == ["https://b.example.com/1", "https://a.example.com/1"]
+    assert entry["source_count"] == 4
+
+
+def test_heuristic_entry_output_is_deterministic():
+    group = [
+        {"title": "CVE-2025-2222 and CVE-2025-1111", "url": "https://a.example.com", "source_name": "Z"},
+        {"title": "Same bug", "summary": "CVE-2024-9999", "url": "https://b.example.com", "source_name": "A"},
+    ]
+    entry = heuristic_entry(group)
+    assert entry["sources"] == ["Z", "A"]
+    assert entry["cves"] == ["CVE-2024-9999", "CVE-2025-1111", "CVE-2025-2222"]
+
+
+def test_guess_category_uses_cvss_score():
+    rep = {"title": "Router flaw", "summary": "Rated CVSS: 9.8 by the vendor", "lang": "en"}
+    assert _guess_category([rep], rep) == "critical"
+    low = {"title": "Router flaw", "summary": "CVSS 7.5", "lang": "en"}
+    assert _guess_category([low], low) == "general"
+
+
+class _FakeAsyncOpenAI:
+    calls = 0
+
+    def __init__(self, base_url, api_key, **kwargs):
+        self.base_url = base_url
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages, **kwargs):
+        _FakeAsyncOpenAI.calls += 1
+        prompt = messages[-1]["content"]
+        if model == "primary" and "Broken" in prompt:
+            raise RuntimeError("primary down")
+        content = json.dumps({"articles": [{"title": f"{model}要約", "summary": "s", "category": "notable"}]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def close(self):
+        pass
+
+
+_LLM_CONFIG = {
+    "primary": {"api_base": "https://p.example.com", "api_key_env": "PRIMARY_KEY", "model": "primary"},
+    "fallback": {"api_base": "https://f.example.com", "api_key_env": "FALLBACK_KEY", "model": "fallback"},
+}
+
+
+def _use_fake_llm(monkeypatch, tmp_path):
+    monkeypatch.setattr(summarizer, "AsyncOpenAI", _FakeAsyncOpenAI)
+    monkeypatch.setenv("PRIMARY_KEY", "k")
+    monkeypatch.setenv("FALLBACK_KEY", "k")
+    monkeypatch.setenv("SECURITY_NEWS_DIGEST_CACHE_DIR", str(tmp_path))
+
+
+def test_summarize_falls_back_per_group(monkeypatch, tmp_path):
+    _use_fake_llm(monkeypatch, tmp_path)
+    llm_config = _LLM_CONFIG
+    groups = [
+        [{"title": "Working story", "url": "https://e.com/1"}],
+        [{"title": "Broken story", "url": "https://e.com/2"}],
+    ]
+    results = summarizer.summarize(groups, llm_config)
+    assert [r["title"] for r in results] == ["primary要約", "fallback要約"]
+    assert results[1]["urls"] == ["https://e.com/2"]
+
+
+def test_summarize_reuses_cached_results(monkeypatch, tmp_path):
+    _use_fake_llm(monkeypatch, tmp_path)
+    groups = [[{"title": "Working story", "url": "https://e.com/1"}]]
+    first = summarizer.summarize(groups, _LLM_CONFIG)
+
+    monkeypatch.setattr(summarizer, "AsyncOpenAI", None)
+    assert summarizer.summarize(groups, _LLM_CONFIG) == first
+
+
+def test_summarize_reuses_similar_cached_result_sharing_cve(monkeypatch, tmp_path):
+    _use_fake_llm(monkeypatch, tmp_path)
+    first = summarizer.summarize(
+        [[{"title": "Chrome zero-day CVE-2025-1111 exploited", "url": "https://e.com/1"}]], _LLM_CONFIG
+    )
+
+    monkeypatch.setattr(summarizer, "AsyncOpenAI", None)
+    group = [{"title": "Chrome zero-day CVE-2025-1111 exploited!", "url": "https://e.com/2"}]
+    assert summarizer.summarize([group], _LLM_CONFIG)[0]["title"] == first[0]["title"]
+
+
+def test_fill_similar_requires_similar_title_and_shared_cve():
+    cached = [
+        {"title": "chrome zero day cve 2025 1111 exploited", "cves": ["CVE-2025-1111"], "result": {"title": "A"}},
+        {"title": "unrelated ransomware story", "cves": [], "result": {"title": "B"}},
+    ]
+    outputs = [None, None, {"title": "kept"}]
+    titles = [
+        "chrome zero day cve 2025 1111 actively exploited",
+        "chrome zero day cve 2025 1111 actively exploited",
+        "anything",
+    ]
+    group_cves = [{"CVE-2025-1111"}, {"CVE-2025-2222"}, set()]
+    summarizer._fill_similar(outputs, titles, group_cves, cached, 0.8)
+    assert outputs == [{"title": "A"}, None, {"title": "kept"}]
+
+
+def test_summarize_sends_identical_prompts_once(monkeypatch, tmp_path):
+    _use_fake_llm(monkeypatch, tmp_path)
+    monkeypatch.setattr(_FakeAsyncOpenAI, "calls", 0)
+    group = [{"title": "Same story", "url": "https://e.com/1"}]
+    results = summarizer.summarize([group, list(group)], {**_LLM_CONFIG, "cache_ttl_days": 0})
+    assert _FakeAsyncOpenAI.calls == 1
+    assert results[0]["title"] == results[1]["title"] == "primary要約"
+
+
+class _FakeBatchOpenAI:
+    def __init__(self, base_url, api_key):
+        self.submitted = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+
+    def _create_file(self, file, purpose):
+        self.submitted = [json.loads(line) for line in file[1].decode("utf-8").splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    def _create_batch(self, **kwargs):
+        return SimpleNamespace(id="batch-1", status="in_progress", output_file_id=None)
+
+    def _retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id="file-out")
+
+    def _content(self, file_id):
+        lines = []
+        for req in self.submitted[:1]:  # 2件目はバッチで失敗した扱い
+            content = json.dumps({"articles": [{"title": "batch要約"}]})
+            body = {"choices": [{"message": {"content": content}}]}
+            lines.append(json.dumps({"custom_id": req["custom_id"], "response": {"body": body}}))
+        return SimpleNamespace(text="\n".join(lines))
+
+    def close(self):
+        pass
+
+
+def test_summarize_batch_falls_back_to_requests_for_missing_results(monkeypatch, tmp_path):
+    _use_fake_llm(monkeypatch, tmp_path)
+    monkeypatch.setattr(summarizer, "OpenAI", _FakeBatchOpenAI)
+    groups = [
+        [{"title": "First story", "url": "https://e.com/1"}],
+        [{"title": "Second story", "url": "https://e.com/2"}],
+    ]
+    config = {**_LLM_CONFIG, "batch_poll_seconds": 0, "cache_ttl_days": 0}
+    results = summarizer.summarize_batch(groups, config)
+    assert [r["title"] for r in results] == ["batch要約", "primary要約"]
+
+
+def test_request_body_adds_json_schema_only_when_enabled():
+    plain = summarizer._request_body({"model": "m"}, "prompt")
+    assert "response_format" not in plain
+    structured = summarizer._request_body({"model": "m", "structured_output": True}, "prompt")
+    assert structured["response_format"]["json_schema"]["schema"] is summarizer.RESPONSE_SCHEMA
+
+
+def test_build_prompt_omits_empty_fields():
+    group = [{"title": "Story", "summary": "x" * 300, "lang": "en", "url": "https://e.com/1"}]
+    prompt = summarizer._build_prompt([group], [set()])
+    assert prompt == "#1\nTitle: Story\nSummary: " + "x" * 200
+
+
+def test_call_llm_accumulates_streamed_chunks():
+    pieces = ['{"articles": [{"title": "ストリ', 'ーム", "summary": "s", "category": "general"}]}']
+
+    async def stream():
+        for text in pieces:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+        yield SimpleNamespace(choices=[])
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return stream()
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    result = asyncio.run(summarizer._call_llm(client, {"model": "m", "stream": True}, "prompt"))
+    assert result["articles"][0]["title"] == "ストリーム"
+
+
+def test_guess_category_critical_terms():
+    for text in ("Flaw exploited in the wild", "Added to KEV", "CVSS 10 bug", "New zero-day"):
+        rep = {"title": text, "lang": "en"}
+        assert _guess_category([rep], rep) == "critical"
+    rep = {"title": "CVSS 7.5 then CVSS: 9.1 after re-scoring", "lang": "en"}
+    assert _guess_category([rep], rep) == "critical"
+
+
+def test_summarize_skips_llm_setup_when_all_cached(monkeypatch, tmp_path):
+    _use_fake_llm(monkeypatch, tmp_path)
+    groups = [[{"title": "Working story", "url": "https://e.com/1"}]]
+    first = summarizer.summarize(groups, _LLM_CONFIG)
+
+    # 全件キャッシュ済みならエンドポイント設定の組み立てもクライアントの作成も行わない
+    monkeypatch.setattr(summarizer, "_endpoint_config", None)
+    monkeypatch.setattr(summarizer, "AsyncOpenAI", None)
+    assert summarizer.summarize(groups, _LLM_CONFIG) == first
+
+
+def test_cache_key_changes_with_model_and_request_parameters():
+    base = summarizer._cache_key("prompt", _LLM_CONFIG)
+    assert summarizer._cache_key("prompt", dict(_LLM_CONFIG)) == base
+    changed_model = {**_LLM_CONFIG, "primary": {**_LLM_CONFIG["primary"], "model": "other"}}
+    structured = {**_LLM_CONFIG, "fallback": {**_LLM_CONFIG["fallback"], "structured_output": True}}
+    for config in (changed_model, structured, {**_LLM_CONFIG, "max_tokens": 2048}, {**_LLM_CONFIG, "temperature": 0}):
+        assert summarizer._cache_key("prompt", config) != base
+
+
+def test_summarize_skip_obvious_keeps_heuristic_entry(monkeypatch, tmp_path):
+    _use_fake_llm(monkeypatch, tmp_path)
+    monkeypatch.setattr(_FakeAsyncOpenAI, "calls", 0)
+    groups = [
+        [{"title": "Added to KEV: CVE-2025-1111", "summary": "x" * 500, "url": "https://e.com/1"}],
+        [{"title": "Working story", "url": "https://e.com/2"}],
+    ]
+    config = {**_LLM_CONFIG, "skip_obvious": True, "cache_ttl_days": 0}
+    results = summarizer.summarize(groups, config)
+    assert _FakeAsyncOpenAI.calls == 1
+    assert results[0]["title"] == "Added to KEV: CVE-2025-1111"
+    assert results[0]["category"] == "critical"
+    assert len(results[0]["summary"]) == summarizer.OBVIOUS_SUMMARY_CHARS
+    assert results[1]["title"] == "primary要約"
+
+
+def test_is_obvious_requires_kev_or_explicit_cvss():
+    def entry(title, lang="en"):
+        return heuristic_entry([{"title": title, "url": "https://e.com/1", "lang": lang}])
+
+    assert summarizer._is_obvious(entry("CISA adds CVE-2025-1111 to KEV"))
+    assert summarizer._is_obvious(entry("CVE-2025-1111 (CVSS 9.8) in router"))
+    assert summarizer._is_obvious(entry("CVE-2025-1111の脆弱性", lang="ja"))
+    assert not summarizer._is_obvious(entry("Kevin Beaumont on CVE-2025-1111"))
+    assert not summarizer._is_obvious(entry("CVE-2025-1111 exploited in the wild"))
+    assert not summarizer._is_obvious(entry("CVE-2025-1111 (CVSS 7.5) in router"))
+    assert not summarizer._is_obvious(entry("Added to KEV"))
+
+
+def _fake_client(model, delay=0.0):
+    async def create(**kwargs):
+        await asyncio.sleep(delay)
+        content = json.dumps({"articles": [{"title": model}]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_summarize_all_hedges_slow_primary(monkeypatch):
+    clients = {"primary": _fake_client("primary", delay=5), "fallback": _fake_client("fallback")}
+    monkeypatch.setattr(summarizer, "_make_client", lambda cfg, registry: clients[cfg["model"]])
+    outputs = asyncio.run(
+        summarizer._summarize_all(["p"], {"model": "primary"}, {"model": "fallback"}, 4, hedge_after=0.01)
+    )
+    assert outputs == [{"title": "fallback"}]
+
+
+def test_summarize_all_counts_fallback_only_when_it_wins(monkeypatch, capsys):
+    clients = {"primary": _fake_client("primary", delay=0.05), "fallback": _fake_client("fallback", delay=5)}
+    monkeypatch.setattr(summarizer, "_make_client", lambda cfg, registry: clients[cfg["model"]])
+    outputs = asyncio.run(
+        summarizer._summarize_all(["p"], {"model": "primary"}, {"model": "fallback"}, 4, hedge_after=0.01)
+    )
+    assert outputs == [{"title": "primary"}]
+    assert "Fallback LLM used" not in capsys.readouterr().out
+
+
+def test_fill_similar_never_reuses_groups_without_cves():
+    cached = [
+        {"title": "microsoft patch tuesday january 2025", "cves": [], "result": {"title": "January"}},
+        {"title": "microsoft patch tuesday february 2025", "cves": ["CVE-2025-1"], "result": {"title": "X"}},
+    ]
+    outputs = [None]
+    summarizer._fill_similar(outputs, ["microsoft patch tuesday february 2025"], [set()], cached, 0.9)
+    assert outputs == [None]
+
+
+class _ChatCompletionHandler(BaseHTTPRequestHandler):
+    """OpenAI互換の ``/chat/completions`` に固定の応答を返すスタブ。"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        content = json.dumps({"articles": [{"title": "実クライアント", "summary": "s", "category": "general"}]})
+        body = json.dumps(
+            {
+                "id": "c1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "m",
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+                ],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_make_client_sends_real_request(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatCompletionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("STUB_KEY", "k")
+    config = {"api_base": f"http://127.0.0.1:{server.server_port}/v1", "api_key_env": "STUB_KEY", "model": "m"}
+
+    async def run():
+        client = summarizer._make_client(config, {})
+        try:
+            return await summarizer._call_llm(client, config, "prompt")
+        finally:
+            await client.close()
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert result["articles"][0]["title"] == "実クライアント"